@@ -6,6 +6,10 @@ A package for plotting CAFAna objects using python/numpy/matplotlib stack.
 
 Available subpackages
 ---------------------
+fit
+    Functions to fit CAFAna objects.
+graph
+    Classes corresponding to the ROOT graphs.
 plot
     Plotting functions for various CAFAna objects.
 rfile
@@ -0,0 +1,7 @@
+"""
+This module contains functions to fit CAFAna objects.
+"""
+
+from .template import TemplateFitResult, fit_templates
+
+__all__ = [ 'fit_templates', 'TemplateFitResult' ]
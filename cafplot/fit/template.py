@@ -0,0 +1,283 @@
+"""
+This module contains a binned likelihood fitter of template normalizations.
+"""
+
+import numpy as np
+
+from cafplot.spectrum import Spectrum
+from cafplot.stats    import get_gauss_chi2, get_poisson_chi2
+
+class TemplateFitResult:
+    """Result of the template normalizations fit
+
+    Parameters
+    ----------
+    norms : ndarray, shape (..., J)
+        Best fit normalizations of templates.
+    cov : ndarray, shape (..., J, J)
+        Covariance matrix of the best fit normalizations.
+    chi2 : ndarray, shape (...)
+        Value of the fit objective (chi^2 + penalty terms) at the best fit.
+    converged : ndarray of bool, shape (...)
+        Flags whether fits have converged.
+    """
+
+    def __init__(self, norms, cov, chi2, converged):
+        self._norms     = norms
+        self._cov       = cov
+        self._chi2      = chi2
+        self._converged = converged
+
+    @property
+    def norms(self):
+        """Best fit normalizations of templates."""
+        return self._norms
+
+    @property
+    def cov(self):
+        """Covariance matrix of the best fit normalizations."""
+        return self._cov
+
+    @property
+    def errors(self):
+        """Errors of the best fit normalizations."""
+        return np.sqrt(np.diagonal(self._cov, axis1 = -2, axis2 = -1))
+
+    @property
+    def chi2(self):
+        """Value of the fit objective at the best fit."""
+        return self._chi2
+
+    @property
+    def converged(self):
+        """Flags whether fits have converged."""
+        return self._converged
+
+def _get_data(data):
+    """Return histogram(s) and squared errors of `data` as a 2D array."""
+    if isinstance(data, Spectrum):
+        # pylint: disable=protected-access
+        data = data._rhist
+
+    if hasattr(data, 'hist'):
+        return (data.hist.reshape((1, -1)), data.err_sq.reshape((1, -1)))
+
+    data = np.asarray(data, dtype = float)
+    data = data.reshape((data.shape[0], -1))
+
+    return (data, data)
+
+def _get_templates(templates, pot, livetime):
+    """Return normalized template histograms as a 2D array."""
+    return np.stack([
+        (t.rhist(pot, livetime) if isinstance(t, Spectrum) else t).hist.ravel()
+            for t in templates
+    ])
+
+def _get_penalty(priors, n_templates):
+    """Return inverse prior variances of template normalizations."""
+    if priors is None:
+        return np.zeros(n_templates)
+
+    return np.array([
+        0 if (sigma is None) else 1 / sigma**2 for sigma in priors
+    ])
+
+def _poisson_objective(data, templates, penalty, norms):
+    pred = norms @ templates
+    return (
+          get_poisson_chi2(data, pred)
+        + np.sum(penalty * (norms - 1)**2, axis = -1)
+    )
+
+def _fit_poisson(data, templates, penalty, max_iter, tol):
+    """Minimize Poisson chi^2 by damped Newton iterations over all datasets.
+
+    Iterations are performed over logarithms of normalizations, which keeps
+    normalizations (and predictions) positive, such that chi^2 stays defined
+    even for datasets without entries.
+    """
+    n_data     = data.shape[0]
+    n_template = templates.shape[0]
+
+    norms     = np.ones((n_data, n_template))
+    chi2      = _poisson_objective(data, templates, penalty, norms)
+    converged = np.zeros(n_data, dtype = bool)
+    stopped   = np.zeros(n_data, dtype = bool)
+    ridge     = 1e-12 * np.eye(n_template)
+
+    for _ in range(max_iter):
+        active = ~stopped
+
+        if not np.any(active):
+            break
+
+        d    = data[active]
+        n    = norms[active]
+        pred = n @ templates
+
+        ratio = np.divide(d, pred, out = np.zeros(d.shape), where = (pred > 0))
+
+        grad = (
+              2 * (1 - ratio) @ templates.T
+            + 2 * penalty * (n - 1)
+        )
+        hess = (
+              2 * np.einsum(
+                  'jb,kb,nb->njk', templates, templates,
+                  np.divide(ratio, pred, out = np.zeros(d.shape),
+                            where = (pred > 0))
+              )
+            + np.diag(2 * penalty)
+        )
+
+        # Gradient and (positive definite part of) Hessian w.r.t. log(norms)
+        grad = grad * n
+        hess = (
+              hess * n[:, :, np.newaxis] * n[:, np.newaxis, :]
+            + np.maximum(grad, 0)[:, :, np.newaxis] * np.eye(n_template)
+            + ridge
+        )
+
+        step = -np.linalg.solve(hess, grad[..., np.newaxis])[..., 0]
+
+        # Expected decrease of chi^2 by the Newton step
+        decrement = -np.sum(grad * step, axis = -1) / 2
+
+        # Limit changes of normalizations to a factor of exp(5) per iteration
+        step *= np.minimum(
+            1, 5 / np.maximum(np.max(np.abs(step), axis = -1), 1e-300)
+        )[:, np.newaxis]
+
+        # Backtracking line search, vectorized over datasets
+        old_chi2  = chi2[active]
+        new_norms = n * np.exp(step)
+        new_chi2  = _poisson_objective(d, templates, penalty, new_norms)
+
+        for _ in range(30):
+            worse = ~(new_chi2 <= old_chi2)
+
+            if not np.any(worse):
+                break
+
+            step[worse]      /= 2
+            new_norms[worse]  = n[worse] * np.exp(step[worse])
+            new_chi2[worse]   = _poisson_objective(
+                d[worse], templates, penalty, new_norms[worse]
+            )
+
+        improved  = (new_chi2 <= old_chi2)
+        new_norms = np.where(improved[:, np.newaxis], new_norms, n)
+        new_chi2  = np.where(improved, new_chi2, old_chi2)
+
+        norms[active] = new_norms
+        chi2 [active] = new_chi2
+
+        # Line searches fail at the optimum due to round-off errors, hence
+        # fits are also converged if the expected decrease is below `tol`.
+        # Other fits with failed line searches are stopped, but not converged.
+        converged[active] = (
+              (improved & (old_chi2 - new_chi2 < tol))
+            | (decrement < tol)
+        )
+        stopped  [active] = (~improved) | converged[active]
+
+    pred  = norms @ templates
+    ratio = np.divide(data, pred**2, out = np.zeros(data.shape),
+                      where = (pred > 0))
+    hess  = (
+          2 * np.einsum('jb,kb,nb->njk', templates, templates, ratio)
+        + np.diag(2 * penalty) + ridge
+    )
+
+    return (norms, 2 * np.linalg.inv(hess), chi2, converged)
+
+def _fit_gauss(data, err_sq, templates, penalty):
+    """Minimize Gaussian chi^2 by solving normal equations for all datasets.
+    """
+    weights = np.divide(
+        1, err_sq, out = np.zeros(err_sq.shape), where = (err_sq > 0)
+    )
+
+    lhs = (
+          np.einsum('jb,kb,nb->njk', templates, templates, weights)
+        + np.diag(penalty)
+    )
+    rhs = (data * weights) @ templates.T + penalty
+
+    cov   = np.linalg.inv(lhs)
+    norms = np.einsum('njk,nk->nj', cov, rhs)
+    chi2  = (
+          get_gauss_chi2(data, norms @ templates, err_sq)
+        + np.sum(penalty * (norms - 1)**2, axis = -1)
+    )
+
+    return (norms, cov, chi2, np.ones(len(data), dtype = bool))
+
+def fit_templates(
+    data, templates, pot = None, livetime = None, priors = None,
+    stat = 'poisson', max_iter = 100, tol = 1e-8
+):
+    """Fit normalizations of template spectra to the data.
+
+    The prediction is a sum of templates scaled by their normalizations.
+    Normalizations are found by minimizing either Poisson or Gaussian chi^2
+    with optional Gaussian penalty terms constraining normalizations around 1.
+    Analytic gradients are used and all datasets (e.g. toy experiments) are
+    fitted at once.
+
+    Parameters
+    ----------
+    data : Spectrum or RHist or ndarray, shape (N, ...)
+        Data to fit. If ndarray, then it is a batch of N data histograms
+        (e.g. toys) and its squared errors are assumed to be Poisson.
+    templates : list of Spectrum or list of RHist
+        Templates to fit. Spectra are normalized by `Spectrum.rhist` to `pot`
+        or `livetime`.
+    pot : float or None, optional
+        POT value to normalize templates to. If both `pot` and `livetime`
+        are None and `data` is Spectrum, then data POT (or livetime) is used.
+    livetime : float or None, optional
+        Livetime value to normalize templates to.
+    priors : list of (float or None) or None, optional
+        Widths of Gaussian penalty terms for each template normalization.
+        None means that the normalization is unconstrained. Default: None.
+    stat : { 'poisson', 'chi2' }, optional
+        Type of the fit statistics. Default: 'poisson'.
+    max_iter : int, optional
+        Maximum number of Newton iterations for the Poisson fit. The Poisson
+        fit keeps normalizations positive.
+    tol : float, optional
+        Convergence tolerance on the objective of the Poisson fit.
+
+    Returns
+    -------
+    TemplateFitResult
+        Fit results. If `data` is not a batch, then the batch dimension is
+        dropped from the results.
+    """
+    if (
+            isinstance(data, Spectrum) and (pot is None) and (livetime is None)
+    ):
+        pot, livetime = data.pot, data.livetime
+
+        if (pot is not None) and (livetime is not None):
+            livetime = None
+
+    batch = not (isinstance(data, Spectrum) or hasattr(data, 'hist'))
+
+    data, err_sq = _get_data(data)
+    templates    = _get_templates(templates, pot, livetime)
+    penalty      = _get_penalty(priors, len(templates))
+
+    if stat == 'poisson':
+        result = _fit_poisson(data, templates, penalty, max_iter, tol)
+    elif stat == 'chi2':
+        result = _fit_gauss(data, err_sq, templates, penalty)
+    else:
+        raise ValueError("Unknown fit statistics: '%s'" % (stat))
+
+    if not batch:
+        result = [ x[0] for x in result ]
+
+    return TemplateFitResult(*result)
@@ -0,0 +1,7 @@
+"""
+This module contains classes corresponding to the ROOT graphs.
+"""
+
+from .graph import Graph
+
+__all__ = [ 'Graph' ]
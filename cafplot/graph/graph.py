@@ -0,0 +1,230 @@
+"""
+This module defines a Graph object corresponding to the ROOT TGraph.
+"""
+
+import numpy as np
+from scipy.interpolate import make_interp_spline
+
+SPLINE_ORDERS = { 'linear' : 1, 'quadratic' : 2, 'cubic' : 3 }
+
+def _coerce_errors(err, n):
+    """Convert symmetric or asymmetric errors into (2, N) array or None."""
+    if err is None:
+        return None
+
+    err = np.asarray(err, dtype = float)
+
+    if err.shape == (n, ):
+        return np.stack([ err, err ])
+
+    if err.shape == (2, n):
+        return err
+
+    raise ValueError(
+        "Graph errors have invalid shape '%s' for %d points" % (err.shape, n)
+    )
+
+class Graph:
+    """Graph object corresponding to the ROOT TGraph.
+
+    `Graph` holds x, y coordinates of the graph points and, optionally,
+    their (asymmetric) errors, as in TGraphErrors and TGraphAsymmErrors.
+    Points are stored in the original order, but `Graph` keeps a cached
+    index sorting them by x, which is used for interpolation and decimation.
+
+    For backward compatibility `Graph` can be unpacked as a tuple `x, y`.
+
+    Parameters
+    ----------
+    x : ndarray, shape (N,)
+        X coordinates of the graph points.
+    y : ndarray, shape (N,)
+        Y coordinates of the graph points.
+    err_x : ndarray, shape (N,) or (2, N), optional
+        Symmetric or asymmetric (low, high) errors of x coordinates.
+    err_y : ndarray, shape (N,) or (2, N), optional
+        Symmetric or asymmetric (low, high) errors of y coordinates.
+    """
+
+    def __init__(self, x, y, err_x = None, err_y = None):
+        self._x = np.asarray(x, dtype = float)
+        self._y = np.asarray(y, dtype = float)
+
+        if (self._x.ndim != 1) or (self._x.shape != self._y.shape):
+            raise ValueError(
+                "Graph x shape '%s' is incompatible with y shape '%s'" \
+                % (self._x.shape, self._y.shape)
+            )
+
+        self._err_x = _coerce_errors(err_x, len(self._x))
+        self._err_y = _coerce_errors(err_y, len(self._x))
+        self._cache = {}
+
+    @property
+    def x(self):
+        """ X coordinates of the graph points """
+        return self._x
+
+    @property
+    def y(self):
+        """ Y coordinates of the graph points """
+        return self._y
+
+    @property
+    def err_x(self):
+        """ (low, high) errors of x coordinates of shape (2, N) or None """
+        return self._err_x
+
+    @property
+    def err_y(self):
+        """ (low, high) errors of y coordinates of shape (2, N) or None """
+        return self._err_y
+
+    @property
+    def n_points(self):
+        """ Number of graph points """
+        return len(self._x)
+
+    def __iter__(self):
+        return iter((self._x, self._y))
+
+    def __getitem__(self, index):
+        return (self._x, self._y)[index]
+
+    def _take(self, index):
+        """Return graph made of points `index`."""
+        err_x = None if self._err_x is None else self._err_x[:, index]
+        err_y = None if self._err_y is None else self._err_y[:, index]
+
+        return Graph(self._x[index], self._y[index], err_x, err_y)
+
+    def get_sort_index(self):
+        """Return (cached) index that sorts graph points by x."""
+        if 'index' not in self._cache:
+            self._cache['index'] = np.argsort(self._x, kind = 'stable')
+
+        return self._cache['index']
+
+    def sorted(self):
+        """Return (cached) graph with points sorted by x."""
+        if 'sorted' not in self._cache:
+            self._cache['sorted'] = self._take(self.get_sort_index())
+
+        return self._cache['sorted']
+
+    def _get_spline(self, k):
+        key = ('spline', k)
+
+        if key not in self._cache:
+            graph = self.sorted()
+            self._cache[key] = make_interp_spline(graph.x, graph.y, k = k)
+
+        return self._cache[key]
+
+    def interpolate(self, x, kind = 'linear', extrapolate = False):
+        """Evaluate graph at points `x` by interpolation.
+
+        Parameters
+        ----------
+        x : float or ndarray
+            Points to evaluate graph at.
+        kind : { 'linear', 'quadratic', 'cubic' }, optional
+            Type of the interpolation. Linear interpolation is performed by
+            `np.interp`, others by (cached) interpolating B-splines.
+            Default: 'linear'.
+        extrapolate : bool, optional
+            If False, then the values outside of the graph x range are NaN.
+            Otherwise, values are extrapolated (constant for 'linear').
+            Default: False.
+
+        Returns
+        -------
+        float or ndarray
+            Graph values at `x`.
+        """
+        graph = self.sorted()
+
+        if kind == 'linear':
+            if extrapolate:
+                return np.interp(x, graph.x, graph.y)
+
+            return np.interp(x, graph.x, graph.y, left = np.nan, right = np.nan)
+
+        if kind not in SPLINE_ORDERS:
+            raise ValueError("Unknown interpolation kind: '%s'" % (kind))
+
+        return self._get_spline(SPLINE_ORDERS[kind])(
+            x, extrapolate = extrapolate
+        )
+
+    def __call__(self, x):
+        return self.interpolate(x)
+
+    def decimate(self, n_buckets, x_range = None):
+        """Decimate graph preserving minima and maxima for plotting.
+
+        The x range is split into `n_buckets` equal buckets (e.g. one bucket
+        per pixel) and only points with minimum and maximum y in each bucket
+        are kept. Plots of the decimated graph are visually identical to the
+        plots of the full graph, while having at most 2 * `n_buckets` + 2
+        points.
+
+        Parameters
+        ----------
+        n_buckets : int
+            Number of buckets.
+        x_range : tuple of 2 float or None, optional
+            Range (low, high) of x to decimate. Points just outside of the
+            range are kept to preserve continuity of lines. If None, the full
+            graph range is used. Default: None.
+
+        Returns
+        -------
+        Graph
+            Decimated graph with points sorted by x.
+        """
+        graph = self.sorted()
+        x, y  = graph.x, graph.y
+
+        if len(x) <= 2 * n_buckets:
+            return graph
+
+        if x_range is None:
+            x_range = (x[0], x[-1])
+
+        edges = np.linspace(x_range[0], x_range[1], n_buckets + 1)
+        first = np.searchsorted(x, edges[0],  side = 'left')
+        last  = np.searchsorted(x, edges[-1], side = 'right')
+
+        starts = np.searchsorted(x[first:last], edges[:-1], side = 'left')
+        starts = np.unique(starts[starts < last - first])
+
+        index = np.arange(first, last)
+
+        if len(starts) > 0:
+            y_in   = y[first:last]
+            pos    = np.arange(len(y_in))
+            counts = np.diff(np.append(starts, len(y_in)))
+
+            y_min = np.repeat(np.minimum.reduceat(y_in, starts), counts)
+            y_max = np.repeat(np.maximum.reduceat(y_in, starts), counts)
+
+            # Index of the first point reaching extremum in each bucket
+            idx_min = np.minimum.reduceat(
+                np.where(y_in == y_min, pos, len(y_in)), starts
+            )
+            idx_max = np.minimum.reduceat(
+                np.where(y_in == y_max, pos, len(y_in)), starts
+            )
+
+            index = np.union1d(idx_min, idx_max)
+            index = first + index[index < len(y_in)]
+
+        if first > 0:
+            index = np.insert(index, 0, first - 1)
+
+        if last < len(x):
+            index = np.append(index, last)
+
+        # pylint: disable=protected-access
+        return graph._take(index)
@@ -2,8 +2,23 @@
 This module contains general purpose plot functions
 """
 
+import io
 import os
+
+import numpy as np
+import matplotlib as mpl
 import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from PIL import Image
+
+RASTER_FORMATS = {
+    'png'  : 'PNG',
+    'jpg'  : 'JPEG',
+    'jpeg' : 'JPEG',
+    'tif'  : 'TIFF',
+    'tiff' : 'TIFF',
+    'webp' : 'WEBP',
+}
 
 def make_plotdir(outdir):
     """Make directory 'plot' in the `outdir` and return its path"""
@@ -12,9 +27,44 @@ def make_plotdir(outdir):
 
     return plotdir
 
-def save_fig(f, fname, ext):
+def _get_tight_bbox(f):
+    """Compute tight bounding box of the figure `f` in inches."""
+    f.draw_without_rendering()
+    return f.get_tightbbox().padded(mpl.rcParams['savefig.pad_inches'])
+
+def _render_rgba(f, bbox, dpi):
+    """Render figure `f` cropped to `bbox` into a PIL RGBA image."""
+    # Render with a dedicated Agg canvas to read the size of the image from
+    # its renderer, restoring the original canvas afterwards.
+    canvas = f.canvas
+    agg    = FigureCanvasAgg(f)
+
+    try:
+        agg.print_figure(
+            io.BytesIO(), format = 'rgba', dpi = dpi, bbox_inches = bbox
+        )
+        image = np.asarray(agg.buffer_rgba())
+    finally:
+        f.set_canvas(canvas)
+
+    return Image.fromarray(image, 'RGBA')
+
+def _encode_raster(image, path, ext, dpi):
+    fmt = RASTER_FORMATS[ext]
+
+    if fmt == 'JPEG':
+        background = Image.new('RGBA', image.size, (255, 255, 255, 255))
+        image      = Image.alpha_composite(background, image).convert('RGB')
+
+    image.save(path, format = fmt, dpi = (dpi, dpi))
+
+def save_fig(f, fname, ext, executor = None):
     """Save figure `f` to a file named `fname`
 
+    The tight bounding box of the figure is computed only once and is reused
+    for all extensions. Raster formats (c.f. `RASTER_FORMATS`) are rendered
+    only once and the rendered image is encoded into each raster format.
+
     Parameters
     ----------
     f : plt.Figure
@@ -25,12 +75,50 @@ def save_fig(f, fname, ext):
         If `ext` is str, then figure will be saved to `fname`.`ext`.
         If `ext` is a list of str, then a number of files will be produced
           one for each extension in the list.
+    executor : concurrent.futures.Executor or None, optional
+        If not None, then encoding of the rendered raster images is submitted
+        to the `executor` (e.g. a ThreadPoolExecutor) and this function
+        returns without waiting for the raster files to be written.
+        Vector formats are always saved before returning, since matplotlib
+        rendering is not thread-safe. Default: None.
+
+    Returns
+    -------
+    list of Future or None
+        Futures of the raster encoding tasks if `executor` is not None.
     """
-    if isinstance(ext, list):
-        for e in ext:
-            save_fig(f, fname, e)
-    else:
-        f.savefig("%s.%s" % (fname, ext), bbox_inches = 'tight')
+    if not isinstance(ext, list):
+        ext = [ ext, ]
+
+    dpi = mpl.rcParams['savefig.dpi']
+
+    if dpi == 'figure':
+        dpi = f.dpi
+
+    bbox  = _get_tight_bbox(f)
+    image = None
+
+    if any(e.lower() in RASTER_FORMATS for e in ext):
+        image = _render_rgba(f, bbox, dpi)
+
+    futures = []
+
+    for e in ext:
+        path = "%s.%s" % (fname, e)
+
+        if e.lower() not in RASTER_FORMATS:
+            f.savefig(path, format = e, dpi = dpi, bbox_inches = bbox)
+        elif executor is None:
+            _encode_raster(image, path, e.lower(), dpi)
+        else:
+            futures.append(
+                executor.submit(_encode_raster, image, path, e.lower(), dpi)
+            )
+
+    if executor is None:
+        return None
+
+    return futures
 
 def remove_bottom_margin(ax):
     """Set bottom of plot to 0 y value."""
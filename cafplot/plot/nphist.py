@@ -3,7 +3,16 @@ Functions for plotting numpy histograms
 """
 
 import numpy as np
-from   matplotlib.image import NonUniformImage
+import matplotlib as mpl
+from   matplotlib.collections import LineCollection, PolyCollection
+from   matplotlib.colors      import to_rgba_array
+
+HIST2D_REDUCERS = {
+    'mean' : np.add,
+    'sum'  : np.add,
+    'max'  : np.maximum,
+    'min'  : np.minimum,
+}
 
 def plot_nphist1d_base(ax, hist, bins, histtype = 'line', **kwargs):
     """Basic function to plot numpy histogram.
@@ -56,8 +65,148 @@ def plot_nphist1d_maker(ax, hist, bins, marker, **kwargs):
     centers = (bins[:-1] + bins[1:]) / 2
     ax.scatter(centers, hist, marker = marker, **kwargs)
 
+def _separate_segments(x, y):
+    """Append NaN vertex to each row of vertices and flatten them."""
+    nan = np.full((len(x), 1), np.nan)
+
+    return (
+        np.concatenate([ x, nan ], axis = -1).ravel(),
+        np.concatenate([ y, nan ], axis = -1).ravel(),
+    )
+
+def decimate_nphist1d(
+    hist, bins, n_columns, x_range = None, histtype = 'step'
+):
+    """Decimate numpy histogram into a min/max preserving line.
+
+    Visible bins of the histogram are grouped into `n_columns` columns of
+    equal width (e.g. pixel columns) and each column is represented by
+    four vertices: values of the first, minimum, maximum and last bins of
+    the column. This preserves peaks of the histogram, while the number of
+    vertices does not depend on the number of bins.
+
+    Parameters
+    ----------
+    hist : ndarray, shape (N,)
+        Histogram to be decimated.
+    bins : ndarray, shape (N+1,)
+        Bind edges for the histogram `hist`.
+    n_columns : int
+        Number of columns.
+    x_range : tuple of 2 float or None, optional
+        Visible range (low, high). If None, the full histogram range is used.
+    histtype : { 'step', 'line' }, optional
+        Histogram style, c.f. `plot_nphist1d_base`. For the 'line' style
+        bins (or columns) are separated by NaN vertices, such that they are
+        not connected by vertical risers. Default: 'step'.
+
+    Returns
+    -------
+    (x, y) : tuple of 2 ndarray
+        Vertices of the line. If there are fewer than 2 * `n_columns`
+        visible bins or the visible range is empty, then the histogram is
+        not decimated.
+    """
+    if histtype not in ('step', 'line'):
+        raise ValueError("Unknown hist type: %s" % (histtype))
+
+    if x_range is None:
+        x_range = (bins[0], bins[-1])
+
+    lo, hi = min(x_range), max(x_range)
+    n      = len(hist)
+    first  = np.clip(np.searchsorted(bins, lo, side = 'right') - 1, 0, n)
+    last   = np.clip(np.searchsorted(bins, hi, side = 'left'), first, n)
+
+    h     = hist[first:last]
+    left  = bins[first:last]
+    right = bins[first + 1:last + 1]
+
+    if (len(h) <= 2 * n_columns) or (hi <= lo):
+        if histtype == 'line':
+            return _separate_segments(
+                np.stack([ left, right ], axis = -1),
+                np.stack([ h, h ], axis = -1)
+            )
+
+        return (np.repeat(bins[first:last + 1], 2)[1:-1], np.repeat(h, 2))
+
+    column = np.floor(((left + right) / 2 - lo) / (hi - lo) * n_columns)
+    column = np.clip(column, 0, n_columns - 1)
+    starts = np.concatenate([ [ 0 ], np.flatnonzero(np.diff(column)) + 1 ])
+    ends   = np.append(starts[1:], len(h))
+
+    col_left  = left[starts]
+    col_right = right[ends - 1]
+    col_mid   = (col_left + col_right) / 2
+
+    x = np.stack([ col_left, col_mid, col_mid, col_right ], axis = -1)
+    y = np.stack([
+        h[starts],
+        np.minimum.reduceat(h, starts),
+        np.maximum.reduceat(h, starts),
+        h[ends - 1],
+    ], axis = -1)
+
+    if histtype == 'line':
+        return _separate_segments(x, y)
+
+    return (x.ravel(), y.ravel())
+
+def plot_nphist1d_lod(
+    ax, hist, bins, n_columns = None, histtype = 'step', **kwargs
+):
+    """Plot numpy histogram as a line decimated to the axes resolution.
+
+    The histogram is decimated by `decimate_nphist1d` to the pixel columns
+    of the axes and is re-decimated each time the x limits of the axes
+    change (e.g. on zoom and pan in interactive use).
+
+    Parameters
+    ----------
+    ax : Axes
+        Matplotlib axes on which histogram will be plotted.
+    hist : ndarray, shape (N,)
+        Histogram to be plotted.
+    bins : ndarray, shape (N+1,)
+        Bind edges for the histogram `hist`.
+    n_columns : int or None, optional
+        Number of columns to decimate histogram into. If None, the width of
+        `ax` in display pixels is used. Default: None.
+    histtype : { 'step', 'line' }, optional
+        Histogram style. Default: 'step'.
+    kwargs : dict, optional
+        Additional parameters to pass directly to the matplotlib plot func.
+
+    Returns
+    -------
+    Line2D
+        Matplotlib line that depicts `hist`.
+    """
+
+    def get_n_columns():
+        if n_columns is not None:
+            return n_columns
+
+        return max(int(ax.get_window_extent().width), 1)
+
+    x, y   = decimate_nphist1d(
+        hist, bins, get_n_columns(), histtype = histtype
+    )
+    line,  = ax.plot(x, y, **kwargs)
+
+    def on_xlim_changed(ax):
+        line.set_data(*decimate_nphist1d(
+            hist, bins, get_n_columns(), ax.get_xlim(), histtype
+        ))
+
+    ax.callbacks.connect('xlim_changed', on_xlim_changed)
+
+    return line
+
 def plot_nphist1d(
-    ax, hist, bins, label, histtype = None, marker = None, **kwargs
+    ax, hist, bins, label, histtype = None, marker = None, lod = False,
+    **kwargs
 ):
     """Plot numpy histogram.
 
@@ -74,11 +223,20 @@ def plot_nphist1d(
     marker : str or None, optional
         If not None this function will add markers on top of histogram bins.
         c.f. help(matplotlib.pyplot.scatter).
+    lod : bool, optional
+        If True, the 'line' and 'step' histograms are decimated to the
+        resolution of the axes, c.f. `plot_nphist1d_lod`. Default: False.
     kwargs : dict, optional
         Additional parameters to pass directly to the matplotlib plotting funcs
     """
 
-    if histtype is not None:
+    if lod and (histtype in ('line', 'step')):
+        plot_nphist1d_lod(
+            ax, hist, bins, histtype = histtype, label = label, **kwargs
+        )
+        label = None
+
+    elif histtype is not None:
         plot_nphist1d_base(ax, hist, bins, histtype, label = label, **kwargs)
         # Do not label markers if histogram was plotted
         label = None
@@ -86,6 +244,99 @@ def plot_nphist1d(
     if marker is not None:
         plot_nphist1d_maker(ax, hist, bins, marker, label = label, **kwargs)
 
+def _get_step_vertices(hists, bins):
+    """Return vertices of step lines of shape (..., 2N, 2) for histograms."""
+    x = np.repeat(bins, 2)[1:-1]
+    y = np.repeat(hists, 2, axis = -1)
+
+    return np.stack(np.broadcast_arrays(x, y), axis = -1)
+
+def _get_stack_colors(ax, color, alpha, n):
+    """Return RGBA colors for `n` stack members."""
+    if color is None:
+        cycle = mpl.rcParams['axes.prop_cycle'].by_key()['color']
+        color = cycle[(len(ax.lines) + len(ax.collections)) % len(cycle)]
+
+    colors = to_rgba_array(color)
+
+    if len(colors) == 1:
+        colors = np.repeat(colors, n, axis = 0)
+
+    if alpha is not None:
+        colors[:, 3] = alpha
+
+    return colors
+
+def plot_nphist1d_stack(
+    ax, hists, bins, label = None, color = None, alpha = None,
+    envelope = None, **kwargs
+):
+    """Plot a stack of many numpy histograms with a single artist.
+
+    Histograms are drawn as step lines of a single `LineCollection`, which
+    is much faster than drawing each histogram separately when there are
+    hundreds of them (e.g. systematic universes). Alternatively, only the
+    envelope band of the histograms is drawn as a `PolyCollection`.
+
+    Parameters
+    ----------
+    ax : Axes
+        Matplotlib axes on which histograms will be plotted.
+    hists : ndarray, shape (K, N)
+        Stack of histograms to be plotted.
+    bins : ndarray, shape (N+1,)
+        Bind edges for the histograms `hists`.
+    label : str or None, optional
+        Label of the stack.
+    color : color or list of color or None, optional
+        Common color or colors of each histogram. If None, a color of the
+        `axes.prop_cycle` cycle is chosen by the number of lines and
+        collections already drawn on `ax`.
+    alpha : float or ndarray, shape (K,), optional
+        Common transparency or transparency of each histogram. Only common
+        transparency is supported when `envelope` is not None.
+    envelope : tuple of 2 float or None, optional
+        If not None, draw only the envelope band between the given quantiles
+        of the histograms in each bin, e.g. (0, 1) for the min/max envelope
+        or (0.16, 0.84) for the central 68% band. Default: None.
+    kwargs : dict, optional
+        Additional parameters to pass directly to the matplotlib
+        `LineCollection` or `PolyCollection`.
+
+    Returns
+    -------
+    LineCollection or PolyCollection
+        Matplotlib collection that depicts `hists`.
+    """
+    hists = np.asarray(hists)
+
+    if envelope is None:
+        colors = _get_stack_colors(ax, color, alpha, len(hists))
+        artist = LineCollection(
+            _get_step_vertices(hists, bins), colors = colors, label = label,
+            **kwargs
+        )
+    else:
+        if np.ndim(alpha) > 0:
+            raise ValueError("Envelope of a stack requires a common alpha")
+
+        low, high = np.quantile(hists, envelope, axis = 0)
+        verts     = np.concatenate([
+            _get_step_vertices(high, bins),
+            _get_step_vertices(low,  bins)[::-1]
+        ])
+
+        colors = _get_stack_colors(ax, color, alpha, 1)
+        artist = PolyCollection(
+            [ verts, ], facecolors = colors, edgecolors = 'none',
+            label = label, **kwargs
+        )
+
+    ax.add_collection(artist)
+    ax.autoscale_view()
+
+    return artist
+
 def plot_nphist1d_error(ax, hist_down, hist_up, bins, err_type, **kwargs):
     """Plot vertical errors defined by numpy histograms
 
@@ -117,9 +368,64 @@ def plot_nphist1d_error(ax, hist_down, hist_up, bins, err_type, **kwargs):
     else:
         raise ValueError("Unknown err type plot: '%s'" % (err_type,))
 
-def plot_nphist2d(ax, hist, bins, **kwargs):
+def _is_uniform(bins):
+    return np.allclose(np.diff(bins), (bins[-1] - bins[0]) / (len(bins) - 1))
+
+def block_reduce_nphist2d(hist, bins, factors, reduce = 'mean'):
+    """Reduce 2D numpy histogram resolution by combining blocks of bins.
+
+    Parameters
+    ----------
+    hist : ndarray, shape (N,M)
+        Histogram to be reduced.
+    bins : (ndarray, ndarray)
+        Bind edges for the histogram.
+    factors : (int, int)
+        Number of bins along each axis to combine into a single bin.
+        The last block along each axis may have fewer bins.
+    reduce : { 'mean', 'sum', 'max', 'min' }, optional
+        Operation to combine bins within a block. Default: 'mean'.
+
+    Returns
+    -------
+    (hist, bins) : tuple of ndarray and (ndarray, ndarray)
+        Reduced histogram and its bin edges.
+    """
+    if reduce not in HIST2D_REDUCERS:
+        raise ValueError("Unknown reduce operation: '%s'" % (reduce))
+
+    ufunc    = HIST2D_REDUCERS[reduce]
+    new_bins = []
+
+    for (axis, factor) in enumerate(factors):
+        n      = hist.shape[axis]
+        starts = np.arange(0, n, factor)
+        hist   = ufunc.reduceat(hist, starts, axis = axis)
+
+        if reduce == 'mean':
+            shape       = [ 1, 1 ]
+            shape[axis] = len(starts)
+            hist = hist / np.diff(np.append(starts, n)).reshape(shape)
+
+        new_bins.append(np.append(bins[axis][starts], bins[axis][-1]))
+
+    return (hist, new_bins)
+
+def _get_axes_resolution(ax):
+    """Return size of the axes in display pixels."""
+    extent = ax.get_window_extent()
+    return (max(int(extent.width), 1), max(int(extent.height), 1))
+
+def plot_nphist2d(
+    ax, hist, bins, downsample = 'mean', resolution = None, **kwargs
+):
     """Draw 2D numpy histogram as a 2D image
 
+    Histograms with uniform bins are drawn by `imshow`, while histograms with
+    non-uniform bins are drawn by a rasterized `pcolormesh`. If histogram has
+    more bins than the axes have pixels, then the histogram is downsampled to
+    the pixel grid by block reduction before drawing.
+
     Parameters
     ----------
     ax : Axes
@@ -128,36 +434,67 @@ def plot_nphist2d(ax, hist, bins, **kwargs):
         Histogram to be plotted.
     bins : (ndarray, ndarray)
         Bind edges for the histograms.
+    downsample : { 'mean', 'sum', 'max', 'min' } or None, optional
+        Operation to combine bins when downsampling, c.f.
+        `block_reduce_nphist2d`. If None, the histogram is not downsampled.
+        Default: 'mean'.
+    resolution : (int, int) or None, optional
+        Target resolution of the downsampled histogram. If None, the size of
+        `ax` in display pixels is used. Default: None.
     kwargs : dict, optional
         Additional parameters to pass directly to the matplotlib
-        NonUniformImage function
+        `imshow` or `pcolormesh` functions.
 
     Returns
     -------
-    NonUniformImage
-        Matplotlib NonUniformImage that depicts `hist`.
+    AxesImage or QuadMesh
+        Matplotlib artist that depicts `hist`.
     """
 
-    bins_x = bins[0]
-    bins_y = bins[1]
+    range_x = (bins[0][0], bins[0][-1])
+    range_y = (bins[1][0], bins[1][-1])
+    uniform = _is_uniform(bins[0]) and _is_uniform(bins[1])
+    factors = [ 1, 1 ]
 
-    range_x = (bins_x[0], bins_x[-1])
-    range_y = (bins_y[0], bins_y[-1])
+    if downsample is not None:
+        if resolution is None:
+            resolution = _get_axes_resolution(ax)
 
-    im = NonUniformImage(
-        ax, origin = 'lower', extent = range_x + range_y, **kwargs
-    )
+        factors = [
+            max(-(-n // res), 1) for (n, res) in zip(hist.shape, resolution)
+        ]
 
-    centers_x = (bins_x[1:] + bins_x[:-1]) / 2
-    centers_y = (bins_y[1:] + bins_y[:-1]) / 2
+        if any(f > 1 for f in factors):
+            hist, bins = block_reduce_nphist2d(hist, bins, factors, downsample)
+
+    if uniform:
+        # The last block may be incomplete, hence the image may extend
+        # beyond the histogram range. The excess is clipped by axes limits.
+        extent = []
+
+        for (axis, factor) in enumerate(factors):
+            width = (bins[axis][1] - bins[axis][0]) / factor
+            extent += [
+                bins[axis][0],
+                bins[axis][0] + hist.shape[axis] * factor * width
+            ]
+
+        kwargs.setdefault('interpolation', 'nearest')
+
+        artist = ax.imshow(
+            hist.T, origin = 'lower', extent = extent, aspect = 'auto',
+            **kwargs
+        )
+    else:
+        kwargs.setdefault('rasterized', True)
+        kwargs.pop('interpolation', None)
 
-    im.set_data(centers_x, centers_y, hist.T)
-    ax.images.append(im)
+        artist = ax.pcolormesh(bins[0], bins[1], hist.T, **kwargs)
 
     ax.set_xlim(range_x)
     ax.set_ylim(range_y)
 
-    return im
+    return artist
 
 def plot_nphist2d_contour(
     ax, hist, bins, level, color = None, label = None, **kwargs
@@ -0,0 +1,366 @@
+"""
+This module contains a pipeline for rendering many figures in parallel.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+import matplotlib.pyplot as plt
+
+from cafplot.rfile    import load
+from cafplot.rhist    import RHist1D, RHist2D
+from cafplot.spectrum import Spectrum
+
+from .funcs import adjust_axes_to_hist, make_figure_with_ratio, save_fig
+from .ratio import plot_rhist1d_ratios
+from .rhist import plot_rhist1d, plot_rhist1d_error, plot_rhist2d
+
+RHIST_TYPES = { 'RHist1D' : RHist1D, 'RHist2D' : RHist2D }
+
+class PlotJob:
+    """A declarative description of a single figure to be rendered.
+
+    Parameters
+    ----------
+    fname : str
+        File name (without extension) to save the figure to.
+    path : str
+        Path to the file containing objects to be plotted, c.f. `load`.
+    objects : list of str
+        Paths of the objects inside the file `path`.
+    obj_type : { 'rhist1d', 'rhist2d', 'spectrum' }, optional
+        Type of the objects to load. Spectra are converted into histograms
+        normalized to `pot` or `livetime`. Default: 'rhist1d'.
+    plot_type : str or callable, optional
+        Type of the plot, one of `PLOT_TYPES` keys: 'rhist1d', 'rhist1d_ratio'
+        or 'rhist2d'. Alternatively, a picklable function
+        `plot_type(rhists, style)` returning a matplotlib Figure.
+        Default: 'rhist1d'.
+    ext : str or list of str, optional
+        Extension(s) of the figure files, c.f. `save_fig`. Default: 'png'.
+    style : dict or None, optional
+        Style of the plot. Builtin plot types support keys 'labels',
+        'colors', 'histtype', 'err_type', 'xlabel', 'ylabel', 'title' and
+        'logy'. Default: None.
+    pot : float or None, optional
+        POT value to normalize spectra to. Default: None.
+    livetime : float or None, optional
+        Livetime value to normalize spectra to. Default: None.
+    """
+
+    # pylint: disable=too-many-instance-attributes
+    def __init__(
+        self, fname, path, objects, obj_type = 'rhist1d',
+        plot_type = 'rhist1d', ext = 'png', style = None,
+        pot = None, livetime = None
+    ):
+        self.fname     = fname
+        self.path      = path
+        self.objects   = list(objects)
+        self.obj_type  = obj_type
+        self.plot_type = plot_type
+        self.ext       = ext
+        self.style     = style or {}
+        self.pot       = pot
+        self.livetime  = livetime
+
+    def get_object_keys(self):
+        """Return keys identifying objects of the job."""
+        return [
+            (self.path, self.obj_type, obj, self.pot, self.livetime)
+                for obj in self.objects
+        ]
+
+class SharedArrays:
+    """A collection of numpy arrays packed into a single shared memory block.
+
+    Arrays are appended one by one. When the block is full, it is replaced
+    by a block of twice the size, such that arrays do not need to be kept
+    alive elsewhere until the total size is known.
+
+    Parameters
+    ----------
+    capacity : int, optional
+        Initial size of the shared memory block in bytes. Default: 1 MiB.
+    """
+
+    def __init__(self, capacity = 2**20):
+        self._specs = []
+        self._size  = 0
+        self._shm   = SharedMemory(create = True, size = max(capacity, 1))
+
+    @property
+    def name(self):
+        """Name of the shared memory block."""
+        return self._shm.name
+
+    @property
+    def specs(self):
+        """List of (offset, shape, dtype) of each array."""
+        return self._specs
+
+    @staticmethod
+    def view(shm, specs):
+        """Return arrays of the shared memory `shm` described by `specs`."""
+        return [
+            np.ndarray(shape, dtype = dtype, buffer = shm.buf, offset = offset)
+                for (offset, shape, dtype) in specs
+        ]
+
+    def _reserve(self, size):
+        if size <= self._shm.size:
+            return
+
+        shm = SharedMemory(create = True, size = max(size, 2 * self._shm.size))
+        shm.buf[:self._size] = self._shm.buf[:self._size]
+
+        self.close()
+        self._shm = shm
+
+    def append(self, arr):
+        """Copy array `arr` into the shared memory and return its index."""
+        arr  = np.ascontiguousarray(arr)
+        spec = (self._size, arr.shape, arr.dtype.str)
+
+        self._reserve(self._size + arr.nbytes)
+        SharedArrays.view(self._shm, [ spec, ])[0][...] = arr
+
+        self._specs.append(spec)
+        # Keep arrays aligned to 8 bytes
+        self._size += -(-arr.nbytes // 8) * 8
+
+        return len(self._specs) - 1
+
+    def close(self):
+        """Close and release the shared memory block."""
+        self._shm.close()
+        self._shm.unlink()
+
+def _load_object(rfile, obj_type, obj_path, pot, livetime):
+    if obj_type == 'rhist1d':
+        obj = rfile.get_rhist1d(obj_path)
+    elif obj_type == 'rhist2d':
+        obj = rfile.get_rhist2d(obj_path)
+    elif obj_type == 'spectrum':
+        obj = rfile.get_spectrum(obj_path)
+    else:
+        raise ValueError("Unknown object type: '%s'" % (obj_type))
+
+    if isinstance(obj, Spectrum):
+        obj = obj.rhist(pot, livetime)
+
+    return obj
+
+def _share_objects(jobs, shared):
+    """Load objects of all jobs into shared memory `shared`.
+
+    Each object and file is loaded only once, and each histogram is packed
+    into the shared memory right after loading, without keeping it alive.
+
+    Returns
+    -------
+    dict
+        Descriptors of each histogram of the form
+        (class name, number of bins arrays, index of the first array).
+    """
+    files       = {}
+    descriptors = {}
+
+    try:
+        for job in jobs:
+            for key in job.get_object_keys():
+                if key in descriptors:
+                    continue
+
+                path = key[0]
+
+                if path not in files:
+                    files[path] = load(path)
+
+                rhist = _load_object(files[path], *key[1:])
+
+                descriptors[key] = (
+                    type(rhist).__name__, len(rhist.bins), len(shared.specs)
+                )
+
+                for arr in list(rhist.bins) + [ rhist.hist, rhist.err_sq ]:
+                    shared.append(arr)
+    finally:
+        for rfile in files.values():
+            rfile.close()
+
+    return descriptors
+
+def _restore_rhist(shm, specs, descriptor):
+    cls_name, n_bins, start = descriptor
+
+    arrays = SharedArrays.view(shm, specs[start:start + n_bins + 2])
+
+    return RHIST_TYPES[cls_name](arrays[:n_bins], *arrays[n_bins:])
+
+def _get_style_list(style, key, n, default = None):
+    values = style.get(key, default)
+
+    if not isinstance(values, (list, tuple)):
+        values = [ values, ] * n
+
+    return values
+
+def _apply_style(ax, style):
+    if 'xlabel' in style:
+        ax.set_xlabel(style['xlabel'])
+
+    if 'ylabel' in style:
+        ax.set_ylabel(style['ylabel'])
+
+    if 'title' in style:
+        ax.set_title(style['title'])
+
+    if style.get('logy', False):
+        ax.set_yscale('log')
+
+def _plot_rhists1d(ax, rhists, style):
+    labels = _get_style_list(style, 'labels', len(rhists))
+    colors = _get_style_list(style, 'colors', len(rhists))
+    colors = [ c or ('C%d' % idx) for (idx, c) in enumerate(colors) ]
+
+    for (rhist, label, color) in zip(rhists, labels, colors):
+        plot_rhist1d(
+            ax, rhist, label, style.get('histtype', 'step'), color = color
+        )
+
+        if style.get('err_type') is not None:
+            plot_rhist1d_error(
+                ax, rhist, err_type = style['err_type'], color = color
+            )
+
+    adjust_axes_to_hist(ax, rhists[0])
+
+    if any(l is not None for l in labels):
+        ax.legend()
+
+    return colors
+
+def plot_job_rhist1d(rhists, style):
+    """Plot RHist1D histograms on a single axes."""
+    f, ax = plt.subplots()
+
+    _plot_rhists1d(ax, rhists, style)
+    _apply_style(ax, style)
+
+    return f
+
+def plot_job_rhist1d_ratio(rhists, style):
+    """Plot RHist1D histograms with their ratios to the first histogram."""
+    f, ax, axr = make_figure_with_ratio()
+
+    colors = _plot_rhists1d(ax, rhists, style)
+    plot_rhist1d_ratios(axr, rhists, colors)
+
+    xlabel = style.pop('xlabel', None)
+    _apply_style(ax, style)
+
+    if xlabel is not None:
+        axr.set_xlabel(xlabel)
+
+    axr.set_ylabel('Ratio')
+
+    return f
+
+def plot_job_rhist2d(rhists, style):
+    """Plot a single RHist2D histogram with a colorbar."""
+    f, ax = plt.subplots()
+
+    im = plot_rhist2d(ax, rhists[0], cmap = style.get('cmap'))
+    f.colorbar(im, ax = ax)
+    _apply_style(ax, style)
+
+    return f
+
+PLOT_TYPES = {
+    'rhist1d'       : plot_job_rhist1d,
+    'rhist1d_ratio' : plot_job_rhist1d_ratio,
+    'rhist2d'       : plot_job_rhist2d,
+}
+
+# Shared memory block of the worker process and specs of its arrays
+_WORKER_SHARED = {}
+
+def _init_worker(shm_name, specs):
+    """Initialize worker process once.
+
+    The Agg backend is selected and the shared memory block is attached,
+    such that its specs are transferred to each worker only once.
+    """
+    plt.switch_backend('Agg')
+
+    _WORKER_SHARED['shm']   = SharedMemory(name = shm_name)
+    _WORKER_SHARED['specs'] = specs
+
+def _render_job(job, descriptors):
+    """Render a single job in a worker process."""
+    rhists = [
+        _restore_rhist(_WORKER_SHARED['shm'], _WORKER_SHARED['specs'], d)
+            for d in descriptors
+    ]
+
+    if callable(job.plot_type):
+        plot_func = job.plot_type
+    else:
+        plot_func = PLOT_TYPES[job.plot_type]
+
+    f = plot_func(rhists, dict(job.style))
+    save_fig(f, job.fname, job.ext)
+    plt.close(f)
+
+def render_jobs(jobs, n_workers = None, mp_context = None):
+    """Render plot jobs in parallel across a process pool.
+
+    Objects of all jobs are loaded once in the main process and packed into
+    a single shared memory block. Worker processes are initialized once with
+    the Agg backend and the layout of the shared memory. Afterwards, they
+    receive only small job descriptions, reading the histograms directly
+    from the shared memory without pickling them.
+
+    Parameters
+    ----------
+    jobs : list of PlotJob
+        Jobs to render.
+    n_workers : int or None, optional
+        Number of worker processes. If None, the number of CPUs is used.
+    mp_context : multiprocessing context or None, optional
+        Multiprocessing context of the pool, c.f. `ProcessPoolExecutor`.
+
+    Returns
+    -------
+    list of (Exception or None)
+        Errors encountered when rendering each job or None on success.
+
+    Notes
+    -----
+    Only histogram contents, errors and bins are shared with workers,
+    covariances of histograms are not passed to the plot functions.
+    """
+    shared = SharedArrays()
+    errors = []
+
+    try:
+        descriptors = _share_objects(jobs, shared)
+
+        with ProcessPoolExecutor(
+            n_workers, mp_context = mp_context, initializer = _init_worker,
+            initargs = (shared.name, shared.specs)
+        ) as executor:
+            futures = [
+                executor.submit(
+                    _render_job, job,
+                    [ descriptors[key] for key in job.get_object_keys() ]
+                ) for job in jobs
+            ]
+
+            errors = [ f.exception() for f in futures ]
+    finally:
+        shared.close()
+
+    return errors
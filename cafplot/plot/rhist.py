@@ -2,11 +2,16 @@
 Functions to plot RHist histograms
 """
 
+import numpy as np
+
 from .nphist import (
-    plot_nphist1d, plot_nphist1d_error, plot_nphist2d, plot_nphist2d_contour
+    plot_nphist1d, plot_nphist1d_error, plot_nphist1d_stack, plot_nphist2d,
+    plot_nphist2d_contour
 )
 
-def plot_rhist1d(ax, rhist, label, histtype = None, marker = None, **kwargs):
+def plot_rhist1d(
+    ax, rhist, label, histtype = None, marker = None, lod = False, **kwargs
+):
     """Plot one dimensional RHist1D histogram.
 
     This is a wrapper around `plot_nphist1d` function.
@@ -22,12 +27,15 @@ def plot_rhist1d(ax, rhist, label, histtype = None, marker = None, **kwargs):
     marker : str or None, optional
         If not None this function will add markers on top of histogram bins.
         c.f. help(matplotlib.pyplot.scatter).
+    lod : bool, optional
+        If True, decimate histogram to the resolution of the axes.
+        c.f. `plot_nphist1d`
     kwargs : dict, optional
         Additional parameters to pass directly to the matplotlib plotting funcs
     """
 
     plot_nphist1d(
-        ax, rhist.hist, rhist.bins_x, label, histtype, marker, **kwargs
+        ax, rhist.hist, rhist.bins_x, label, histtype, marker, lod, **kwargs
     )
 
 def plot_rhist1d_error(
@@ -60,6 +68,37 @@ def plot_rhist1d_error(
         ax, hist_down, hist_up, rhist.bins_x, err_type, **kwargs
     )
 
+def plot_rhist1d_stack(ax, rhists, label = None, **kwargs):
+    """Plot many one dimensional RHist1D histograms with a single artist.
+
+    This is a wrapper around `plot_nphist1d_stack` function.
+
+    Parameters
+    ----------
+    ax : Axes
+        Matplotlib axes on which histograms will be plotted.
+    rhists : list of RHist1D
+        Histograms to be plotted. All histograms must have the same binning.
+    label : str or None, optional
+        Label of the stack.
+    kwargs : dict, optional
+        Additional parameters to pass to the `plot_nphist1d_stack` function.
+
+    Returns
+    -------
+    LineCollection or PolyCollection
+        Matplotlib collection that depicts `rhists`.
+    """
+    # pylint: disable=protected-access
+    for rhist in rhists[1:]:
+        if not rhists[0]._are_bins_compatible(rhist):
+            raise ValueError("Histograms have incompatible binnings")
+
+    return plot_nphist1d_stack(
+        ax, np.stack([ x.hist for x in rhists ]), rhists[0].bins_x, label,
+        **kwargs
+    )
+
 def plot_rhist2d(ax, rhist, **kwargs):
     """Draw a two dimensional RHist2D histogram as an image.
 
@@ -70,13 +109,12 @@ def plot_rhist2d(ax, rhist, **kwargs):
     rhist : RHist2D
         Histogram to be plotted.
     kwargs : dict, optional
-        Additional parameters to pass directly to the matplotlib
-        NonUniformImage function
+        Additional parameters to pass to the `plot_nphist2d` function.
 
     Returns
     -------
-    NonUniformImage
-        Matplotlib NonUniformImage that depicts `rhist`.
+    AxesImage or QuadMesh
+        Matplotlib artist that depicts `rhist`.
     """
 
     return plot_nphist2d(ax, rhist.hist, rhist.bins, **kwargs)
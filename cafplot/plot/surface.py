@@ -2,6 +2,7 @@
 Functions for plotting cafplot.surface.Surface
 """
 
+from matplotlib.collections import LineCollection
 from .rhist import plot_rhist2d, plot_rhist2d_contour
 
 def plot_surface(ax, surface, **kwargs):
@@ -50,6 +51,8 @@ def plot_surface_gauss_contour(ax, surface, sigma = 1, **kwargs):
     surface : Surface
         cafplot.surface.Surface which contour should be shown.
         Surface object must have `.level` method implemented.
+    sigma : float, optional
+        Significance expressed as a number of Gaussian sigmas. Default: 1.
     kwargs : dict, optional
         Values to pass to the `plot_rhist2d_contour` function
 
@@ -59,6 +62,57 @@ def plot_surface_gauss_contour(ax, surface, sigma = 1, **kwargs):
         matplotlib contour set
     """
 
-    level = surface.level(sigma)
-    return plot_rhist2d_contour(ax, surface.rhist, level, **kwargs)
+    rhist, level = surface.contour_rhist(sigma)
+    return plot_rhist2d_contour(ax, rhist, level, **kwargs)
 
+
+def plot_surface_contours(
+    ax, surface, sigmas = (1, 2, 3), color = None, label = None, **kwargs
+):
+    """Plot cached `surface` contours corresponding to significances `sigmas`.
+
+    Unlike `plot_surface_gauss_contour` this function does not rerun contour
+    finding on every call, but draws contours cached by `Surface.contours`
+    as LineCollection objects.
+
+    Parameters
+    ----------
+    ax : Axes
+        matplotlib axes on which contours will be plotted.
+    surface : Surface
+        cafplot.surface.Surface which contours should be shown.
+    sigmas : list of float, optional
+        Significances expressed as a number of Gaussian sigmas.
+        Default: (1, 2, 3).
+    color : str or list of str or None, optional
+        Colors for each contour to be drawn. If `color` is a str then
+        all contours will have the same color.
+    label : str or list of str or None, optional
+        Labels for contours. If `label` is str, then only the first contour
+        will be labeled.
+    kwargs : dict, optional
+        Values to pass to the LineCollection constructor.
+
+    Returns
+    -------
+    list of LineCollection
+        matplotlib line collections, one for each sigma.
+    """
+    segments = surface.contours(sigmas)
+
+    if not isinstance(color, (tuple, list)):
+        color = [ color, ] * len(segments)
+
+    if not isinstance(label, (tuple, list)):
+        label = [ label, ] + [ None, ] * (len(segments) - 1)
+
+    result = []
+
+    for (seg, c, l) in zip(segments, color, label):
+        collection = LineCollection(seg, colors = c, label = l, **kwargs)
+        ax.add_collection(collection, autolim = True)
+        result.append(collection)
+
+    ax.autoscale_view()
+
+    return result
@@ -16,8 +16,18 @@ class IRFile:
         """Load ROOT 2D histogram RHist2D specified by `path`."""
         raise NotImplementedError
 
+    def get_rprofile1d(self, path):
+        """Load ROOT 1D profile histogram RProfile1D specified by `path`."""
+        raise NotImplementedError
+
+    def get_refficiency(self, path):
+        """Load ROOT TEfficiency as REfficiency specified by `path`."""
+        raise NotImplementedError
+
     def get_graph(self, path):
-        """Load ROOT TGraph as a tuple of (x, y) arrays specified by `path`."""
+        """Load ROOT TGraph (TGraphErrors, TGraphAsymmErrors) as a Graph
+        specified by `path`.
+        """
         raise NotImplementedError
 
     def get_spectrum(self, path):
@@ -28,6 +38,15 @@ class IRFile:
         """Load CAFAna FrequentistSurface specified by `path`."""
         raise NotImplementedError
 
+    def get_fcsurface(self, path, crit_paths):
+        """Load CAFAna FrequentistSurface specified by `path` together with
+        Feldman-Cousins critical value maps specified by `crit_paths`.
+
+        `crit_paths` is a dictionary of paths to the critical value maps
+        keyed by significance expressed as a number of Gaussian sigmas.
+        """
+        raise NotImplementedError
+
     def close(self):
         """Close file and release resources."""
         raise NotImplementedError
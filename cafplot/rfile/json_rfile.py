@@ -5,9 +5,10 @@ A class for loading CAFAna objects from ROOT files.
 import json
 import numpy as np
 
+from cafplot.graph    import Graph
 from cafplot.rhist    import RHist1D, RHist2D
 from cafplot.spectrum import Spectrum
-from cafplot.surface  import FSurface
+from cafplot.surface  import FCSurface, FSurface
 
 from .irfile import IRFile
 
@@ -99,13 +100,26 @@ class JSONRFile(IRFile):
         d = JSONRFile._get_dict_by_path(path, self._dict)
         return JSONRFile._load_rhist2d(d)
 
+    @staticmethod
+    def _load_graph_errors(d, axis):
+        if (axis + '_err_low') in d:
+            return np.array([ d[axis + '_err_low'], d[axis + '_err_high'] ])
+
+        if (axis + '_err') in d:
+            return np.array(d[axis + '_err'])
+
+        return None
+
     def get_graph(self, path):
         d = JSONRFile._get_dict_by_path(path, self._dict)
 
         x = np.array(d['x'])
         y = np.array(d['y'])
 
-        return (x, y)
+        err_x = JSONRFile._load_graph_errors(d, 'x')
+        err_y = JSONRFile._load_graph_errors(d, 'y')
+
+        return Graph(x, y, err_x, err_y)
 
     def get_spectrum(self, path):
         spectr_dict = self._get_dict_by_path(path, self._dict)
@@ -120,3 +134,13 @@ class JSONRFile(IRFile):
         surf_dict = JSONRFile._get_dict_by_path(path, self._dict)
         return FSurface(*JSONRFile._load_surf_internals(surf_dict))
 
+    def get_fcsurface(self, path, crit_paths):
+        surf_dict = JSONRFile._get_dict_by_path(path, self._dict)
+        crit_maps = {
+            sigma : self.get_rhist2d(crit_path)
+                for (sigma, crit_path) in crit_paths.items()
+        }
+
+        return FCSurface(
+            *JSONRFile._load_surf_internals(surf_dict), crit_maps
+        )
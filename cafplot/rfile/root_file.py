@@ -5,9 +5,10 @@ A class for loading CAFAna objects from ROOT files.
 import uproot
 import numpy as np
 
-from cafplot.rhist    import RHist1D, RHist2D
+from cafplot.graph    import Graph
+from cafplot.rhist    import RHist1D, RHist2D, RProfile1D, REfficiency
 from cafplot.spectrum import Spectrum
-from cafplot.surface  import FSurface
+from cafplot.surface  import FCSurface, FSurface
 
 from .irfile import IRFile
 
@@ -31,7 +32,7 @@ class ROOTFile(IRFile):
     def _load_hist_internals(hist):
         values = hist.values()
         err_sq = hist.variances()
-        bins   = np.array([ ax.edges() for ax in hist.axes ])
+        bins   = [ ax.edges() for ax in hist.axes ]
 
         return (bins, values, err_sq)
 
@@ -44,14 +45,12 @@ class ROOTFile(IRFile):
         return RHist2D(*ROOTFile._load_hist_internals(d.get(path)))
 
     @staticmethod
-    def _load_rhist(path, d):
-        hist = d.get(path)
-        ndim = hist.values.ndim
+    def _make_rhist(hist):
+        ndim = len(hist.axes)
         args = ROOTFile._load_hist_internals(hist)
 
         if ndim == 1:
-            bins, values, err_sq = args
-            return RHist1D([bins,], values, err_sq)
+            return RHist1D(*args)
 
         elif ndim == 2:
             return RHist2D(*args)
@@ -59,6 +58,10 @@ class ROOTFile(IRFile):
         else:
             raise NotImplementedError
 
+    @staticmethod
+    def _load_rhist(path, d):
+        return ROOTFile._make_rhist(d.get(path))
+
     @staticmethod
     def _load_surf_internals(surf_dir):
         rhist    = ROOTFile._load_rhist2d('hist', surf_dir)
@@ -76,12 +79,58 @@ class ROOTFile(IRFile):
     def get_rhist2d(self, path):
         return ROOTFile._load_rhist2d(path, self._f)
 
+    def get_rprofile1d(self, path):
+        profile = self._f.get(path)
+
+        bins   = profile.axis().edges()
+        sum_w  = np.asarray(profile.member('fBinEntries'), dtype = float)
+        sum_w2 = np.asarray(profile.member('fBinSumw2'),   dtype = float)
+
+        # TProfile values are the bin means: sum(w*y) / sum(w)
+        sum_wy  = profile.values(flow = True) * sum_w
+        sum_wy2 = np.asarray(profile.member('fSumw2'), dtype = float)
+
+        # Unweighted TProfile does not store sum of squared weights
+        if len(sum_w2) != len(sum_w):
+            sum_w2 = None
+        else:
+            sum_w2 = sum_w2[1:-1]
+
+        # Strip overflow/underflow bins
+        return RProfile1D(
+            [bins, ], sum_w[1:-1], sum_wy[1:-1], sum_wy2[1:-1], sum_w2
+        )
+
+    def get_refficiency(self, path):
+        efficiency = self._f.get(path)
+
+        passed = ROOTFile._make_rhist(efficiency.member('fPassedHistogram'))
+        total  = ROOTFile._make_rhist(efficiency.member('fTotalHistogram'))
+
+        return REfficiency(passed, total)
+
+    @staticmethod
+    def _load_graph_errors(graph, sym_name, low_name, high_name):
+        if graph.has_member(low_name):
+            return np.array([
+                graph.member(low_name), graph.member(high_name)
+            ])
+
+        if graph.has_member(sym_name):
+            return np.array(graph.member(sym_name))
+
+        return None
+
     def get_graph(self, path):
         graph = self._f.get(path)
-        x = graph.xvalues
-        y = graph.yvalues
 
-        return (x, y)
+        x = np.array(graph.member('fX'))
+        y = np.array(graph.member('fY'))
+
+        err_x = ROOTFile._load_graph_errors(graph, 'fEX', 'fEXlow', 'fEXhigh')
+        err_y = ROOTFile._load_graph_errors(graph, 'fEY', 'fEYlow', 'fEYhigh')
+
+        return Graph(x, y, err_x, err_y)
 
     def get_spectrum(self, path):
         spectr_dir = self._f.get(path)
@@ -95,6 +144,16 @@ class ROOTFile(IRFile):
     def get_fsurface(self, path):
         return FSurface(*ROOTFile._load_surf_internals(self._f.get(path)))
 
+    def get_fcsurface(self, path, crit_paths):
+        crit_maps = {
+            sigma : self.get_rhist2d(crit_path)
+                for (sigma, crit_path) in crit_paths.items()
+        }
+
+        return FCSurface(
+            *ROOTFile._load_surf_internals(self._f.get(path)), crit_maps
+        )
+
     def close(self):
         self._f.close()
 
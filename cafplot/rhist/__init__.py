@@ -2,8 +2,14 @@
 This module contains classes corresponding to the ROOT histograms.
 """
 
-from .rhist1d import RHist1D
-from .rhist2d import RHist2D
-
-__all__ = [ 'RHist1D', 'RHist2D' ]
+from .covariance  import Covariance, DenseCovariance, LowRankCovariance
+from .refficiency import REfficiency
+from .rhist1d     import RHist1D
+from .rhist2d     import RHist2D
+from .rprofile1d  import RProfile1D
+from .sparse      import SparseRHist
 
+__all__ = [
+    'Covariance', 'DenseCovariance', 'LowRankCovariance', 'REfficiency',
+    'RHist1D', 'RHist2D', 'RProfile1D', 'SparseRHist'
+]
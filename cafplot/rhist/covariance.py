@@ -0,0 +1,218 @@
+"""
+This module contains classes for the covariance matrices of histogram bins.
+"""
+
+import numpy as np
+
+class Covariance:
+    """An abstract covariance matrix of the (flattened) histogram bins"""
+
+    @property
+    def n_bins(self):
+        """ Number of histogram bins """
+        raise NotImplementedError
+
+    def diag(self):
+        """Return diagonal of the covariance matrix."""
+        raise NotImplementedError
+
+    def to_dense(self):
+        """Return covariance as a dense matrix of shape (n_bins, n_bins)."""
+        raise NotImplementedError
+
+    def scale(self, jac):
+        """Propagate covariance through bin-wise scaling by `jac`.
+
+        Parameters
+        ----------
+        jac : float or ndarray, shape (n_bins,)
+            Derivative of each bin of the result w.r.t. the corresponding bin.
+
+        Returns
+        -------
+        Covariance
+            Covariance J C J, where J = diag(`jac`).
+        """
+        raise NotImplementedError
+
+    def transform(self, func):
+        """Propagate covariance through a linear transformation `func`.
+
+        Parameters
+        ----------
+        func : callable
+            Linear function mapping arrays of shape (K, n_bins) into arrays
+            of shape (K, n_bins_new) row by row.
+
+        Returns
+        -------
+        Covariance
+            Covariance L C L^T, where L is the matrix of `func`.
+        """
+        raise NotImplementedError
+
+    def __add__(self, other):
+        """Return covariance of a sum of two independent histograms."""
+        return DenseCovariance(self.to_dense() + other.to_dense())
+
+class DenseCovariance(Covariance):
+    """Covariance stored as a dense matrix
+
+    Parameters
+    ----------
+    matrix : ndarray, shape (n_bins, n_bins)
+        Covariance matrix.
+    """
+
+    def __init__(self, matrix):
+        super(DenseCovariance, self).__init__()
+        self._matrix = matrix
+
+    @property
+    def matrix(self):
+        """ Covariance matrix """
+        return self._matrix
+
+    @property
+    def n_bins(self):
+        return self._matrix.shape[0]
+
+    def diag(self):
+        return np.diagonal(self._matrix).copy()
+
+    def to_dense(self):
+        return self._matrix
+
+    def scale(self, jac):
+        jac = np.broadcast_to(jac, (self.n_bins, ))
+        return DenseCovariance(self._matrix * np.outer(jac, jac))
+
+    def transform(self, func):
+        return DenseCovariance(func(func(self._matrix).T))
+
+class LowRankCovariance(Covariance):
+    """Covariance stored as a low-rank factor
+
+    The covariance matrix is given by C = F^T F, where F is a factor of
+    shape (n_universes, n_bins). This representation is natural for the
+    multiverse derived covariances and allows to propagate covariances
+    without constructing (n_bins, n_bins) matrices.
+
+    Parameters
+    ----------
+    factor : ndarray, shape (n_universes, n_bins)
+        Covariance factor.
+    label : str or None, optional
+        Label of the set of universes the factor is derived from. Factors
+        with the same label are treated as fully correlated, universe by
+        universe, in histogram arithmetic. Default: None.
+    """
+
+    def __init__(self, factor, label = None):
+        super(LowRankCovariance, self).__init__()
+        self._factor = factor
+        self._label  = label
+
+    @staticmethod
+    def from_universes(universes, nominal = None, label = None):
+        """Construct covariance from histograms of the multiverse.
+
+        Parameters
+        ----------
+        universes : ndarray, shape (n_universes, ...)
+            Histograms of each universe.
+        nominal : ndarray or None, optional
+            Nominal histogram. If None, then the mean of universes is used.
+        label : str or None, optional
+            Label of the universes, c.f. `LowRankCovariance`.
+
+        Returns
+        -------
+        LowRankCovariance
+            Covariance of the universes around the `nominal`.
+        """
+        universes = np.asarray(universes, dtype = float)
+        universes = universes.reshape((universes.shape[0], -1))
+
+        if nominal is None:
+            nominal = np.mean(universes, axis = 0)
+            norm    = np.sqrt(len(universes) - 1)
+        else:
+            nominal = np.asarray(nominal).ravel()
+            norm    = np.sqrt(len(universes))
+
+        return LowRankCovariance((universes - nominal) / norm, label)
+
+    @property
+    def factor(self):
+        """ Covariance factor of shape (n_universes, n_bins) """
+        return self._factor
+
+    @property
+    def label(self):
+        """ Label of the universes the factor is derived from """
+        return self._label
+
+    @property
+    def n_bins(self):
+        return self._factor.shape[1]
+
+    def diag(self):
+        return np.sum(self._factor**2, axis = 0)
+
+    def to_dense(self):
+        return self._factor.T @ self._factor
+
+    def scale(self, jac):
+        return LowRankCovariance(self._factor * jac, self._label)
+
+    def transform(self, func):
+        return LowRankCovariance(func(self._factor), self._label)
+
+    def __add__(self, other):
+        """Return covariance of a sum of two histograms.
+
+        Factors with the same (not None) label are fully correlated universe
+        by universe, hence they are summed row-wise and keep the label.
+        Other factors are independent and are concatenated.
+        """
+        if not isinstance(other, LowRankCovariance):
+            return super(LowRankCovariance, self).__add__(other)
+
+        if (self._label is not None) and (self._label == other.label):
+            return LowRankCovariance(self._factor + other.factor, self._label)
+
+        return LowRankCovariance(np.concatenate([ self._factor, other.factor ]))
+
+def propagate_covariance(cov_a, jac_a, cov_b, jac_b):
+    """Propagate covariances of two histograms through a bin-wise binop.
+
+    Parameters
+    ----------
+    cov_a : Covariance or None
+        Covariance of the first histogram.
+    jac_a : float or ndarray
+        Derivative of the result w.r.t. the first histogram bins.
+    cov_b : Covariance or None
+        Covariance of the second histogram.
+    jac_b : float or ndarray
+        Derivative of the result w.r.t. the second histogram bins.
+
+    Returns
+    -------
+    Covariance or None
+        Covariance of the result. Low-rank covariances with the same label
+        are propagated as fully correlated, all other covariances are treated
+        as independent.
+    """
+    if (cov_a is None) and (cov_b is None):
+        return None
+
+    if cov_b is None:
+        return cov_a.scale(jac_a)
+
+    if cov_a is None:
+        return cov_b.scale(jac_b)
+
+    # c.f. `LowRankCovariance.__add__` for the treatment of labels
+    return cov_a.scale(jac_a) + cov_b.scale(jac_b)
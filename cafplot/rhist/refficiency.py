@@ -0,0 +1,127 @@
+"""
+This module contains class definition for the ROOT-like efficiency.
+"""
+
+import numpy as np
+
+from cafplot.stats import (
+    gauss_sigma_to_prob, get_bayesian_interval, get_clopper_pearson_interval,
+    get_wilson_interval
+)
+
+INTERVALS = {
+    'clopper-pearson' : get_clopper_pearson_interval,
+    'bayesian'        : get_bayesian_interval,
+    'wilson'          : get_wilson_interval,
+}
+
+class REfficiency:
+    """A ROOT-like efficiency (c.f. ROOT TEfficiency)
+
+    `REfficiency` holds histograms of passed and total events and calculates
+    binomial efficiency and its confidence intervals for all bins at once.
+    Efficiencies from different data shards can be merged by adding them
+    together.
+
+    `REfficiency` provides `hist`, `bins` and `get_error_margin` similar to
+    `RHist`, so 1D efficiencies can be plotted with `plot_rhist1d` and
+    `plot_rhist1d_error`.
+
+    Parameters
+    ----------
+    passed : RHist
+        Histogram of events passed selection.
+    total : RHist
+        Histogram of all events. Must have the same binning as `passed`.
+    """
+
+    def __init__(self, passed, total):
+        # pylint: disable=protected-access
+        if not passed._are_bins_compatible(total):
+            raise ValueError("Histograms have incompatible binnings")
+
+        self._passed = passed
+        self._total  = total
+
+    @staticmethod
+    def merge(efficiencies):
+        """Merge a list of `REfficiency` filled from different data shards."""
+        result = efficiencies[0]
+
+        for efficiency in efficiencies[1:]:
+            result = result + efficiency
+
+        return result
+
+    @property
+    def passed(self):
+        """ Histogram of events passed selection """
+        return self._passed
+
+    @property
+    def total(self):
+        """ Histogram of all events """
+        return self._total
+
+    @property
+    def bins(self):
+        """ List of bin edges for each dimension """
+        return self._total.bins
+
+    @property
+    def bins_x(self):
+        """ Bin edges for the first dimension """
+        return self._total.bins[0]
+
+    @property
+    def ndim(self):
+        """ Number of histogram dimensions """
+        return self._total.ndim
+
+    @property
+    def hist(self):
+        """ Efficiency in each bin. Efficiency of empty bins is 0 """
+        total = self._total.hist
+
+        return np.divide(
+            self._passed.hist, total,
+            out = np.zeros(total.shape), where = (total != 0)
+        )
+
+    def get_error_margin(self, err = None, sigma = 1):
+        """Return lower and upper confidence limits of the efficiency.
+
+        Parameters
+        ----------
+        err : { None, 'clopper-pearson', 'wilson', 'bayesian' }
+            Type of the binomial confidence interval.
+            By default it will use 'clopper-pearson' interval.
+        sigma : float
+            Confidence expressed as a number of Gaussian sigmas.
+
+        Returns
+        -------
+        (lower, upper) : tuple of 2 ndarray
+            lower and upper confidence limits for the efficiency
+        """
+        if err is None:
+            err = 'clopper-pearson'
+
+        if err not in INTERVALS:
+            raise ValueError("Unknown error type: '%s'" % (err))
+
+        prob = gauss_sigma_to_prob(sigma)
+        return INTERVALS[err](self._passed.hist, self._total.hist, prob)
+
+    def __add__(self, other):
+        # pylint: disable=protected-access
+        if not isinstance(other, REfficiency):
+            raise RuntimeError(
+                "Do not know how to handle binop of a REfficiency and %s." % (
+                    type(other)
+                )
+            )
+
+        return REfficiency(
+            self._passed + other._passed, self._total + other._total
+        )
@@ -2,11 +2,16 @@
 Base class for ROOT-like histograms
 """
 
+import numbers
+
 import numpy as np
 from cafplot.stats import (
     gauss_sigma_to_prob, get_poisson_confidence_interval,
-    get_histogram_statistics
+    get_histogram_statistics, get_histogram_moments, generate_poisson_toys,
+    get_histogram_cdf, get_cdf_quantiles
 )
+from .covariance import propagate_covariance
+from .smooth     import smooth_gaussian
 
 class RHist:
     """A base class for ROOT-like histograms
@@ -15,6 +20,15 @@ class RHist:
     associated to each bin. `RHist` support basic arithmetic operations,
     and histogram scaling.
 
+    Quantities derived from the histogram data (e.g. cumulative sums used by
+    `integrate_bins`) are cached. The cache is invalidated by `scale` and
+    inplace arithmetic operations, but not by direct modifications of the
+    `hist` and `err_sq` arrays.
+
+    Optionally, `RHist` may carry a covariance matrix of its (flattened)
+    bins. The covariance is propagated through scaling and arithmetic
+    operations in addition to the squared errors, c.f. `Covariance`.
+
     Parameters
     ----------
     bins : list of ndarray
@@ -24,9 +38,12 @@ class RHist:
     err_sq : ndarray, optional
         Numpy histogram of squared errors associate to each bin.
         If not specified errors are assumed to be 0.
+    cov : Covariance or None, optional
+        Covariance of the histogram bins, in addition to the uncorrelated
+        squared errors `err_sq`. Default: None.
     """
 
-    def __init__(self, bins, hist, err_sq = None):
+    def __init__(self, bins, hist, err_sq = None, cov = None):
         self._bins = bins
         self._hist = hist
 
@@ -34,6 +51,8 @@ class RHist:
             err_sq = np.zeros(hist.shape)
 
         self._err_sq = err_sq
+        self._cov    = cov
+        self._cache  = {}
 
         self._self_sanity_check()
 
@@ -52,6 +71,18 @@ class RHist:
         """ Squared error for each bin """
         return self._err_sq
 
+    @property
+    def cov(self):
+        """ Covariance of the histogram bins or None """
+        return self._cov
+
+    def get_total_err_sq(self):
+        """Return squared errors including diagonal of the covariance."""
+        if self._cov is None:
+            return self._err_sq
+
+        return self._err_sq + self._cov.diag().reshape(self._hist.shape)
+
     @property
     def ndim(self):
         """ Number of histogram dimensions """
@@ -68,7 +99,8 @@ class RHist:
         err : { None, 'normal', 'poisson' }
             Type of the statistics to use for calculating error margin.
             Supported statistics: 'normal' and 'poisson'. By default it
-            will use the 'normal' distribution.
+            will use the 'normal' distribution. The 'normal' errors include
+            diagonal of the covariance `cov`, if present.
         sigma : float
             Confidence expressed as a number of Gaussian sigmas.
 
@@ -78,7 +110,7 @@ class RHist:
             lower and upper error margins for the histogram
         """
         if (err is None) or (err == 'normal'):
-            err = sigma * np.sqrt(self._err_sq)
+            err = sigma * np.sqrt(self.get_total_err_sq())
             return (self._hist - err, self._hist + err)
 
         if err == 'poisson':
@@ -87,6 +119,20 @@ class RHist:
 
         raise ValueError("Unknown error type: '%s'" % (err))
 
+    def _project(self, axis):
+        """Project histogram on the axis `axis` by summing over other axes."""
+        if (axis >= self.ndim) or (axis < 0):
+            raise RuntimeError(
+                "Dimension %d exceedes histogram ndim %d" % (axis, self.ndim)
+            )
+
+        if self.ndim == 1:
+            return self._hist
+
+        return np.sum(
+            self._hist, axis = tuple(i for i in range(self.ndim) if i != axis)
+        )
+
     def get_stat(self, stat, axis = 0):
         """Calculate statistical property of a histogram along axis
 
@@ -106,26 +152,266 @@ class RHist:
         --------
         get_histogram_statistics : performs the actual calculation
         """
+        return get_histogram_statistics(
+            self._project(axis), self._bins[axis], stat
+        )
 
-        if (axis >= self.ndim) or (axis < 0):
-            raise RuntimeError(
-                "Dimension %d exceedes histogram ndim %d" % (axis, self.ndim)
-            )
+    def get_stats(self, axis = 0, quantiles = None):
+        """Calculate all statistical properties of a histogram along axis
 
-        if self.ndim == 1:
-            projected_hist = self._hist
+        Parameters
+        ----------
+        axis : int
+            Axis along which statistics will be calculated
+        quantiles : list of float or None, optional
+            Probability levels of quantiles to calculate. Default: None.
+
+        Returns
+        -------
+        dict
+            Dictionary of statistics { 'integral', 'mean', 'rms', 'stdev',
+            'skewness' } and optionally 'quantiles'. Unlike `get_stat`,
+            'rms' and 'stdev' are the root mean square and the standard
+            deviation.
+
+        See Also
+        --------
+        get_histogram_moments : performs the actual calculation
+        """
+        return get_histogram_moments(
+            self._project(axis), self._bins[axis], quantiles = quantiles
+        )
+
+    def cdf(self, axis = 0, project = True):
+        """Return (cached) cumulative distribution of a histogram along axis
+
+        Parameters
+        ----------
+        axis : int
+            Axis along which cumulative distribution will be calculated
+        project : bool, optional
+            If True, then cumulative distribution of the histogram projection
+            on `axis` is calculated (c.f. `get_stats`). Otherwise, cumulative
+            distributions along `axis` are calculated for each bin of the
+            other axes. Default: True.
+
+        Returns
+        -------
+        ndarray
+            Values of the cumulative distribution at the bin edges along
+            `axis`. If `project` is True, then it has shape (N+1,).
+            Otherwise, it has shape of the histogram with N+1 elements
+            along `axis`.
+
+        See Also
+        --------
+        get_histogram_cdf : performs the actual calculation
+        """
+        key = ('cdf', axis, project)
+
+        if key not in self._cache:
+            if project:
+                self._cache[key] = get_histogram_cdf(self._project(axis))
+            else:
+                self._cache[key] = get_histogram_cdf(self._hist, axis)
+
+        return self._cache[key]
+
+    def quantile(self, q, axis = 0, project = True):
+        """Calculate quantiles of a histogram along axis
+
+        Quantiles are calculated with linear interpolation inside bins
+        of the cached cumulative distribution `cdf`.
+
+        Parameters
+        ----------
+        q : float or array_like of float, shape (Q,)
+            Probability levels in [0, 1].
+        axis : int
+            Axis along which quantiles will be calculated
+        project : bool, optional
+            c.f. `cdf`. Default: True.
+
+        Returns
+        -------
+        float or ndarray
+            Quantiles. If `project` is False, quantiles are calculated for
+            each bin of the other axes, which form leading dimensions of the
+            result.
+
+        See Also
+        --------
+        get_cdf_quantiles : performs the actual calculation
+        """
+        cdf = self.cdf(axis, project)
+
+        if project:
+            return get_cdf_quantiles(cdf, self._bins[axis], q)
+
+        return get_cdf_quantiles(cdf, self._bins[axis], q, axis)
+
+    def _get_cumsum(self):
+        """Return (cached) summed-area tables of `hist` and `err_sq`.
+
+        Each table is padded by a leading zero along each dimension, such that
+        element [i, j, ...] holds the sum over bins [:i, :j, ...].
+        """
+        if 'cumsum' not in self._cache:
+            shape = tuple(n + 1 for n in self._hist.shape)
+            inner = tuple(slice(1, None) for _ in self._hist.shape)
+
+            cum_hist   = np.zeros(shape)
+            cum_err_sq = np.zeros(shape)
+
+            cum_hist  [inner] = self._hist
+            cum_err_sq[inner] = self._err_sq
+
+            for axis in range(self.ndim):
+                np.cumsum(cum_hist,   axis = axis, out = cum_hist)
+                np.cumsum(cum_err_sq, axis = axis, out = cum_err_sq)
+
+            self._cache['cumsum'] = (cum_hist, cum_err_sq)
+
+        return self._cache['cumsum']
+
+    def _find_bin_range(self, axis, low, high):
+        """Find range [first, last) of bins along `axis` overlapping [low, high)
+
+        `low` and `high` may be None, in which case the range extends to the
+        histogram edges.
+        """
+        bins = self._bins[axis]
+        n    = len(bins) - 1
+
+        if low is None:
+            first = 0
         else:
-            projected_hist = np.sum(
-                self._hist,
-                axis = (i for i in range(len(self.ndim)) if i != axis)
-            )
+            first = np.searchsorted(bins, low, side = 'right') - 1
+
+        if high is None:
+            last = n
+        else:
+            last = np.searchsorted(bins, high, side = 'left')
+
+        first = np.clip(first, 0, n)
+        last  = np.clip(last,  0, n)
+
+        return (first, np.maximum(first, last))
+
+    def integrate_bins(self, first, last):
+        """Integrate histogram over a range of bins.
+
+        This function uses cached summed-area tables of the histogram, so that
+        each integral is computed in O(1) regardless of the range size.
+
+        Parameters
+        ----------
+        first : list of int or list of ndarray
+            Index of the first bin of the range for each dimension.
+        last : list of int or list of ndarray
+            Index past the last bin of the range for each dimension.
+            Indices may be arrays (broadcastable to each other), in which case
+            integrals for all the ranges are computed at once.
+
+        Returns
+        -------
+        (integral, err) : tuple of 2 float or tuple of 2 ndarray
+            Integral of the histogram over the range and its error.
+        """
+        cum_hist, cum_err_sq = self._get_cumsum()
+
+        integral = 0
+        err_sq   = 0
+
+        # Inclusion-exclusion over all corners of the range
+        for corner in range(2**self.ndim):
+            index = []
+            sign  = 1
+
+            for axis in range(self.ndim):
+                if corner & (1 << axis):
+                    index.append(first[axis])
+                    sign = -sign
+                else:
+                    index.append(last[axis])
+
+            index     = tuple(index)
+            integral += sign * cum_hist  [index]
+            err_sq   += sign * cum_err_sq[index]
+
+        # Guard against negative round-off errors
+        return (integral, np.sqrt(np.maximum(err_sq, 0)))
+
+    def toys(self, n_toys, seed = None, **kwargs):
+        """Generate a batch of Poisson fluctuations of the histogram.
+
+        Parameters
+        ----------
+        n_toys : int
+            Number of toys to generate.
+        seed : int or SeedSequence or None, optional
+            Seed of the random streams. Default: None.
+        kwargs : dict, optional
+            Additional parameters to pass to `generate_poisson_toys`.
+
+        Returns
+        -------
+        ndarray, shape (n_toys, ...)
+            Toys stored as a single array.
+        """
+        return generate_poisson_toys(self._hist, n_toys, seed, **kwargs)
+
+    def smooth(self, sigma, truncate = 4.0):
+        """Return histogram smoothed by a Gaussian kernel.
+
+        Parameters
+        ----------
+        sigma : float or list of float
+            Width of the Gaussian kernel in units of bins, either common or
+            for each dimension.
+        truncate : float, optional
+            Truncate kernel at this many sigmas. Default: 4.
+
+        Returns
+        -------
+        RHist
+            Smoothed histogram. Squared errors and covariance are propagated
+            through the convolution.
+
+        See Also
+        --------
+        smooth_gaussian : performs the actual smoothing
+        """
+        hist, err_sq = smooth_gaussian(
+            self._hist, self._err_sq, sigma, truncate = truncate
+        )
+
+        if self._cov is None:
+            cov = None
+        else:
+            shape = self._hist.shape
+            axes  = tuple(range(1, len(shape) + 1))
+
+            def func(x):
+                x = smooth_gaussian(
+                    x.reshape((-1, ) + shape), None, sigma, axes, truncate
+                )[0]
+                return x.reshape((len(x), -1))
 
-        return get_histogram_statistics(projected_hist, self._bins[axis], stat)
+            cov = self._cov.transform(func)
+
+        return type(self)(self._bins, hist, err_sq, cov)
 
     def scale(self, factor):
         """Scale histogram inplace by a `factor`."""
-        self._hist   = factor * self.hist
-        self._err_sq = factor**2 * self.err_sq
+        cov = None if (self._cov is None) else self._cov.scale(factor)
+        self._set_data(factor * self.hist, factor**2 * self.err_sq, cov)
+
+    def _set_data(self, hist, err_sq, cov):
+        self._hist   = hist
+        self._err_sq = err_sq
+        self._cov    = cov
+        self._cache  = {}
 
     def _self_sanity_check(self):
         hist_shape = self.hist.shape
@@ -137,6 +423,12 @@ class RHist:
                 % (hist_shape, err_shape)
             )
 
+        if (self._cov is not None) and (self._cov.n_bins != self.hist.size):
+            raise RuntimeError(
+                "Covariance size %d is not equal to number of bins %d" \
+                % (self._cov.n_bins, self.hist.size)
+            )
+
         for dim,bins_dim in enumerate(self.bins):
             if len(bins_dim.shape) != 1:
                 raise RuntimeError(
@@ -177,41 +469,49 @@ class RHist:
                 raise ValueError("Histograms have incompatible binnings")
             return other
 
-        elif isinstance(other, (int, float)):
-            return RHist(self.bins, other, 0)
-
-        else:
-            RuntimeError(
-                "Do not know how to handle binop of a RHist and %s." % (
-                    type(other)
-                )
+        elif isinstance(other, numbers.Number):
+            return RHist(
+                self.bins,
+                np.full(self.hist.shape, other), np.zeros(self.hist.shape)
             )
 
-        return None
+        raise RuntimeError(
+            "Do not know how to handle binop of a RHist and %s." % (
+                type(other)
+            )
+        )
 
     def __add__(self, other):
         other = self._coerce_other(other)
 
         hist   = self.hist   + other.hist
         err_sq = self.err_sq + other.err_sq
+        cov    = propagate_covariance(self.cov, 1, other.cov, 1)
 
-        return type(self)(self._bins, hist, err_sq)
+        return type(self)(self._bins, hist, err_sq, cov)
 
     def __sub__(self, other):
         other = self._coerce_other(other)
 
         hist   = self.hist   - other.hist
         err_sq = self.err_sq + other.err_sq
+        cov    = propagate_covariance(self.cov, 1, other.cov, -1)
 
-        return type(self)(self._bins, hist, err_sq)
+        return type(self)(self._bins, hist, err_sq, cov)
 
     def __mul__(self, other):
         other = self._coerce_other(other)
 
         hist   = self.hist * other.hist
         err_sq = (other.hist**2 * self.err_sq + self.hist**2 * other.err_sq)
+        cov    = None
+
+        if (self.cov is not None) or (other.cov is not None):
+            cov = propagate_covariance(
+                self.cov, other.hist.ravel(), other.cov, self.hist.ravel()
+            )
 
-        return type(self)(self._bins, hist, err_sq)
+        return type(self)(self._bins, hist, err_sq, cov)
 
     def __div__(self, other):
         other = self._coerce_other(other)
@@ -221,9 +521,37 @@ class RHist:
             (1 / other.hist)**2 * self.err_sq
           + (self.hist / other.hist**2)**2  * other.err_sq
         )
+        cov = None
+
+        # Jacobians are computed only when there are covariances to propagate
+        if (self.cov is not None) or (other.cov is not None):
+            cov = propagate_covariance(
+                self.cov,  (1 / other.hist).ravel(),
+                other.cov, (-self.hist / other.hist**2).ravel()
+            )
 
-        return (type(self))(self._bins, hist, err_sq)
+        return (type(self))(self._bins, hist, err_sq, cov)
 
     def __truediv__(self, other):
         return self.__div__(other)
 
+    def __iadd__(self, other):
+        result = self.__add__(other)
+        self._set_data(result.hist, result.err_sq, result.cov)
+        return self
+
+    def __isub__(self, other):
+        result = self.__sub__(other)
+        self._set_data(result.hist, result.err_sq, result.cov)
+        return self
+
+    def __imul__(self, other):
+        result = self.__mul__(other)
+        self._set_data(result.hist, result.err_sq, result.cov)
+        return self
+
+    def __itruediv__(self, other):
+        result = self.__div__(other)
+        self._set_data(result.hist, result.err_sq, result.cov)
+        return self
+
@@ -3,7 +3,10 @@ This module contains class definition for the 1D ROOT-like histogram.
 """
 
 import numpy as np
-from .rhist import RHist
+from .rhist  import RHist
+from .smooth import (
+    get_uniform_bins, reduce_bins, smooth_gaussian, smooth_353qh
+)
 
 class RHist1D(RHist):
     """A 1D ROOT-like histogram"""
@@ -47,8 +50,96 @@ class RHist1D(RHist):
 
         return RHist1D([bins,], hist, err_sq)
 
+    @staticmethod
+    def from_data_kde(
+        data, bins, bandwidth, weights = None, range = None, oversample = 4
+    ):
+        """Constructs a smoothed `RHist1D` by a binned kernel density estimate.
+
+        Data are binned into a histogram `oversample` times finer than
+        `bins`, which is then convolved with a Gaussian kernel and summed
+        back into `bins`. The cost of this estimate does not depend on the
+        number of data points beyond the initial binning.
+
+        Parameters
+        ----------
+        data : ndarray, shape (N,)
+            Dataset to be binned
+        bins : list of float or int
+            Uniform bin edges or number of bins, c.f. `RHist1D.from_data`.
+        bandwidth : float
+            Width of the Gaussian kernel in units of `data`.
+        weights : ndarray, shape (N,), optional
+            Weights associated to each data point.
+        range : tuple of 2 floats, optional
+            Range (low, high) for the bins.
+        oversample : int, optional
+            Number of fine bins per each bin. Default: 4.
+
+        Returns
+        -------
+        RHist1D
+            A smoothed ROOT-like histogram built from the `data`.
+        """
+        # pylint: disable=redefined-builtin
+        bins = np.histogram_bin_edges(data, bins = bins, range = range)
+        fine_bins, width = get_uniform_bins(bins, oversample)
+
+        fine = RHist1D.from_data(data, fine_bins, weights)
+        hist, err_sq = smooth_gaussian(fine.hist, fine.err_sq, bandwidth/width)
+
+        return RHist1D(
+            [bins,],
+            reduce_bins(hist, oversample), reduce_bins(err_sq, oversample)
+        )
+
     @property
     def bins_x(self):
         """ Bin edges """
         return self.bins[0]
 
+    def integral(self, low = None, high = None):
+        """Integrate histogram over bins overlapping range [low, high).
+
+        Integrals are computed in O(1) time by means of cached cumulative sums
+        of the histogram, c.f. `RHist.integrate_bins`.
+
+        Parameters
+        ----------
+        low : float or ndarray or None, optional
+            Lower end of the range. If None, integrate from the first bin.
+        high : float or ndarray or None, optional
+            Upper end of the range. If None, integrate up to the last bin.
+            If `low` and `high` are arrays, then integrals over all ranges
+            are computed at once.
+
+        Returns
+        -------
+        (integral, err) : tuple of 2 float or tuple of 2 ndarray
+            Integral of the histogram over the range and its error.
+        """
+        first, last = self._find_bin_range(0, low, high)
+        return self.integrate_bins([ first, ], [ last, ])
+
+    def smooth_353qh(self, n_times = 1):
+        """Return histogram smoothed by the ROOT 353QH algorithm.
+
+        Unlike `smooth`, this smoothing is non-linear, hence squared errors
+        and covariance of the histogram are kept unchanged, similarly to
+        `TH1::Smooth`.
+
+        Parameters
+        ----------
+        n_times : int, optional
+            Number of times to apply the smoothing. Default: 1.
+
+        Returns
+        -------
+        RHist1D
+            Smoothed histogram.
+        """
+        return RHist1D(
+            self._bins, smooth_353qh(self._hist, n_times), self._err_sq,
+            self._cov
+        )
+
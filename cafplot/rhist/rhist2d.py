@@ -3,7 +3,8 @@ This module contains class definition for the 2D ROOT-like histogram.
 """
 
 import numpy as np
-from .rhist import RHist
+from .rhist  import RHist
+from .smooth import get_uniform_bins, reduce_bins, smooth_gaussian
 
 class RHist2D(RHist):
     """A 2D ROOT-like histogram"""
@@ -52,10 +53,64 @@ class RHist2D(RHist):
         else:
             w_sq = weights**2
 
-        err_sq, _ = np.histogram(data_x, data_y, bins, weights = w_sq)
+        err_sq, _, _ = np.histogram2d(data_x, data_y, bins, weights = w_sq)
 
         return RHist2D(bins, hist, err_sq)
 
+    @staticmethod
+    def from_data_kde(
+        data_x, data_y, bins_x, bins_y, bandwidth, weights = None,
+        range_x = None, range_y = None, oversample = 4
+    ):
+        """Constructs a smoothed `RHist2D` by a binned kernel density estimate.
+
+        c.f. `RHist1D.from_data_kde`
+
+        Parameters
+        ----------
+        data_x : ndarray, shape (N,)
+            First coordinates of the data points to be binned.
+        data_y : ndarray, shape (N,)
+            Second coordinates of the data points to be binned.
+        bins_x : list of float or int
+            Uniform bin edges or number of bins for the first dimension.
+        bins_y : list of float or int
+            Uniform bin edges or number of bins for the second dimension.
+        bandwidth : float or tuple of 2 float
+            Widths of the Gaussian kernel in units of the data coordinates.
+        weights : ndarray, shape (N,), optional
+            Weights associated to each data point.
+        range_x : tuple of 2 floats, optional
+            Range (low, high) for the bins in the first dimension.
+        range_y : tuple of 2 floats, optional
+            Range (low, high) for the bins in the second dimension.
+        oversample : int, optional
+            Number of fine bins per each bin along each dimension. Default: 4.
+
+        Returns
+        -------
+        RHist2D
+            A smoothed ROOT-like 2D histogram built from the data.
+        """
+        bins_x = np.histogram_bin_edges(data_x, bins = bins_x, range = range_x)
+        bins_y = np.histogram_bin_edges(data_y, bins = bins_y, range = range_y)
+
+        fine_x, width_x = get_uniform_bins(bins_x, oversample)
+        fine_y, width_y = get_uniform_bins(bins_y, oversample)
+
+        fine      = RHist2D.from_data(data_x, data_y, fine_x, fine_y, weights)
+        bandwidth = np.broadcast_to(bandwidth, (2, ))
+
+        hist, err_sq = smooth_gaussian(
+            fine.hist, fine.err_sq,
+            [ bandwidth[0] / width_x, bandwidth[1] / width_y ]
+        )
+
+        return RHist2D(
+            [ bins_x, bins_y ],
+            reduce_bins(hist, oversample), reduce_bins(err_sq, oversample)
+        )
+
     @property
     def bins_x(self):
         """ Bin edges for the first dimension """
@@ -66,3 +121,29 @@ class RHist2D(RHist):
         """ Bin edges for the second dimension """
         return self._bins[1]
 
+    def integral(self, range_x = None, range_y = None):
+        """Integrate histogram over bins overlapping a rectangular window.
+
+        Integrals are computed in O(1) time by means of a cached summed-area
+        table of the histogram, c.f. `RHist.integrate_bins`.
+
+        Parameters
+        ----------
+        range_x : tuple of 2 (float or ndarray or None) or None, optional
+            Range [low, high) of the window in the first dimension.
+            None values correspond to the histogram edges.
+        range_y : tuple of 2 (float or ndarray or None) or None, optional
+            Range [low, high) of the window in the second dimension.
+            If ranges are arrays, then integrals over all windows are
+            computed at once.
+
+        Returns
+        -------
+        (integral, err) : tuple of 2 float or tuple of 2 ndarray
+            Integral of the histogram over the window and its error.
+        """
+        first_x, last_x = self._find_bin_range(0, *(range_x or (None, None)))
+        first_y, last_y = self._find_bin_range(1, *(range_y or (None, None)))
+
+        return self.integrate_bins([ first_x, first_y ], [ last_x, last_y ])
+
@@ -0,0 +1,275 @@
+"""
+This module contains class definition for the 1D ROOT-like profile histogram.
+"""
+
+import numpy as np
+from .rhist1d import RHist1D
+
+class RProfile1D:
+    """A 1D ROOT-like profile histogram
+
+    `RProfile1D` holds per bin accumulators of the sum of weights w, sum of
+    weighted values w*y, sum of weighted squared values w*y^2, and sum of
+    squared weights w^2. These accumulators are sufficient to calculate
+    the mean and spread of y in each bin. Profiles filled from different
+    chunks of data can be merged by adding them together.
+
+    `RProfile1D` provides `hist`, `bins_x` and `get_error_margin` similar to
+    `RHist1D`, so it can be plotted with `plot_rhist1d` and
+    `plot_rhist1d_error`.
+
+    Parameters
+    ----------
+    bins : list of ndarray
+        List with a single array of bin edges.
+    sum_w : ndarray, shape (N,)
+        Sum of weights in each bin.
+    sum_wy : ndarray, shape (N,)
+        Sum of weighted values in each bin.
+    sum_wy2 : ndarray, shape (N,)
+        Sum of weighted squared values in each bin.
+    sum_w2 : ndarray, shape (N,), optional
+        Sum of squared weights in each bin. If not specified, the profile is
+        assumed to be unweighted, i.e. `sum_w2` = `sum_w`.
+    """
+
+    def __init__(self, bins, sum_w, sum_wy, sum_wy2, sum_w2 = None):
+        self._bins    = bins
+        self._sum_w   = np.asarray(sum_w,   dtype = float)
+        self._sum_wy  = np.asarray(sum_wy,  dtype = float)
+        self._sum_wy2 = np.asarray(sum_wy2, dtype = float)
+
+        if sum_w2 is None:
+            sum_w2 = self._sum_w.copy()
+
+        self._sum_w2 = np.asarray(sum_w2, dtype = float)
+
+        self._self_sanity_check()
+
+    @staticmethod
+    def from_data(data_x, data_y, bins, weights = None, range = None):
+        """Constructs a `RProfile1D` from the data.
+
+        Parameters
+        ----------
+        data_x : ndarray, shape (N,)
+            Data to be binned.
+        data_y : ndarray, shape (N,)
+            Data to be profiled.
+        bins : list of float or int
+            List of bin edges. if `bins` is an int, then the bin edges are
+            calculated by splitting `range` into `bins` equal segments.
+        weights : ndarray, shape (N,), optional
+            Weights associated to each data point. By default all data points
+            are weighted with equal weight of 1.
+        range : tuple of 2 floats, optional
+            Range (low, high) for the bins.
+
+        Returns
+        -------
+        RProfile1D
+            A ROOT-like profile histogram built from the data.
+        """
+        # pylint: disable=redefined-builtin
+        bins  = np.histogram_bin_edges(data_x, bins = bins, range = range)
+        zeros = np.zeros(len(bins) - 1)
+
+        result = RProfile1D(
+            [bins, ], zeros, zeros.copy(), zeros.copy(), zeros.copy()
+        )
+        result.fill(data_x, data_y, weights)
+
+        return result
+
+    @staticmethod
+    def merge(profiles):
+        """Merge a list of `RProfile1D` filled from different data chunks."""
+        result = profiles[0]
+
+        for profile in profiles[1:]:
+            result = result + profile
+
+        return result
+
+    @property
+    def bins(self):
+        """ List of bin edges """
+        return self._bins
+
+    @property
+    def bins_x(self):
+        """ Bin edges """
+        return self._bins[0]
+
+    @property
+    def ndim(self):
+        """ Number of histogram dimensions """
+        return 1
+
+    @property
+    def sum_w(self):
+        """ Sum of weights in each bin """
+        return self._sum_w
+
+    @property
+    def sum_wy(self):
+        """ Sum of weighted values in each bin """
+        return self._sum_wy
+
+    @property
+    def sum_wy2(self):
+        """ Sum of weighted squared values in each bin """
+        return self._sum_wy2
+
+    @property
+    def sum_w2(self):
+        """ Sum of squared weights in each bin """
+        return self._sum_w2
+
+    @property
+    def entries(self):
+        """ Effective number of entries in each bin """
+        return np.divide(
+            self._sum_w**2, self._sum_w2,
+            out = np.zeros(self._sum_w.shape), where = (self._sum_w2 > 0)
+        )
+
+    @property
+    def hist(self):
+        """ Mean of y in each bin. Empty bins have mean 0 """
+        return np.divide(
+            self._sum_wy, self._sum_w,
+            out = np.zeros(self._sum_w.shape), where = (self._sum_w != 0)
+        )
+
+    @property
+    def spread(self):
+        """ Standard deviation of y in each bin """
+        mean_y2 = np.divide(
+            self._sum_wy2, self._sum_w,
+            out = np.zeros(self._sum_w.shape), where = (self._sum_w != 0)
+        )
+
+        return np.sqrt(np.abs(mean_y2 - self.hist**2))
+
+    @property
+    def err_sq(self):
+        """ Squared error on the mean of y in each bin """
+        entries = self.entries
+
+        return np.divide(
+            self.spread**2, entries,
+            out = np.zeros(entries.shape), where = (entries > 0)
+        )
+
+    def fill(self, data_x, data_y, weights = None):
+        """Fill profile inplace with a chunk of data.
+
+        Parameters
+        ----------
+        data_x : ndarray, shape (N,)
+            Data to be binned.
+        data_y : ndarray, shape (N,)
+            Data to be profiled.
+        weights : ndarray, shape (N,), optional
+            Weights associated to each data point. By default all data points
+            are weighted with equal weight of 1.
+        """
+        data_x = np.asarray(data_x)
+        data_y = np.asarray(data_y)
+
+        if weights is None:
+            weights = np.ones(data_x.shape)
+
+        bins  = self.bins_x
+        n_bin = len(bins) - 1
+        index = np.searchsorted(bins, data_x, side = 'right') - 1
+
+        # Follow numpy convention: the last bin is closed on both ends
+        index[data_x == bins[-1]] = n_bin - 1
+        mask = (index >= 0) & (index < n_bin)
+
+        index = index[mask]
+        w     = np.asarray(weights)[mask]
+        y     = data_y[mask]
+
+        self._sum_w   += np.bincount(index, w,        minlength = n_bin)
+        self._sum_wy  += np.bincount(index, w * y,    minlength = n_bin)
+        self._sum_wy2 += np.bincount(index, w * y**2, minlength = n_bin)
+        self._sum_w2  += np.bincount(index, w**2,     minlength = n_bin)
+
+    def get_error_margin(self, err = None, sigma = 1):
+        """Return lower and upper error margins for the profile means.
+
+        Parameters
+        ----------
+        err : { None, 'normal', 'spread' }
+            If None or 'normal', then error margins are errors on the mean
+            of y in each bin. If 'spread', then error margins are standard
+            deviations of y in each bin.
+        sigma : float
+            Confidence expressed as a number of Gaussian sigmas.
+
+        Returns
+        -------
+        (lower, upper) : tuple of 2 ndarray
+            lower and upper error margins for the profile
+        """
+        if (err is None) or (err == 'normal'):
+            err = sigma * np.sqrt(self.err_sq)
+        elif err == 'spread':
+            err = sigma * self.spread
+        else:
+            raise ValueError("Unknown error type: '%s'" % (err))
+
+        hist = self.hist
+        return (hist - err, hist + err)
+
+    def to_rhist1d(self, err = None):
+        """Convert profile into `RHist1D` of means of y.
+
+        Parameters
+        ----------
+        err : { None, 'normal', 'spread' }
+            Type of errors of the resulting histogram, c.f. `get_error_margin`
+
+        Returns
+        -------
+        RHist1D
+            Histogram of means of y with corresponding squared errors.
+        """
+        low, _ = self.get_error_margin(err)
+        return RHist1D(self._bins, self.hist, (self.hist - low)**2)
+
+    def _self_sanity_check(self):
+        if (len(self._bins) != 1) or (len(self._bins[0].shape) != 1):
+            raise RuntimeError("Profile bins have invalid shape")
+
+        shape = (len(self._bins[0]) - 1, )
+
+        for name in [ '_sum_w', '_sum_wy', '_sum_wy2', '_sum_w2' ]:
+            if getattr(self, name).shape != shape:
+                raise RuntimeError(
+                    "Profile accumulator '%s' shape '%s' is incompatible "
+                    "with bins" % (name[1:], getattr(self, name).shape)
+                )
+
+    def __add__(self, other):
+        # pylint: disable=protected-access
+        if not isinstance(other, RProfile1D):
+            raise RuntimeError(
+                "Do not know how to handle binop of a RProfile1D and %s." % (
+                    type(other)
+                )
+            )
+
+        if not np.array_equal(self.bins_x, other.bins_x):
+            raise ValueError("Profiles have incompatible binnings")
+
+        return RProfile1D(
+            self._bins,
+            self._sum_w   + other._sum_w,
+            self._sum_wy  + other._sum_wy,
+            self._sum_wy2 + other._sum_wy2,
+            self._sum_w2  + other._sum_w2,
+        )
@@ -0,0 +1,198 @@
+"""
+This module contains histogram smoothing functions.
+"""
+
+import numpy as np
+import scipy.signal
+
+def get_gaussian_kernel(sigma, truncate = 4.0):
+    """Return normalized Gaussian kernel of width `sigma` (in bins)."""
+    radius = max(int(truncate * sigma + 0.5), 1)
+    x      = np.arange(-radius, radius + 1)
+    kernel = np.exp(-0.5 * (x / sigma)**2)
+
+    return kernel / np.sum(kernel)
+
+def _convolve_axis(x, kernel, axis):
+    shape       = [ 1 ] * x.ndim
+    shape[axis] = len(kernel)
+
+    return scipy.signal.oaconvolve(
+        x, kernel.reshape(shape), mode = 'same', axes = axis
+    )
+
+def _get_axes_sigmas(ndim, sigma, axes):
+    if axes is None:
+        axes = tuple(range(ndim))
+
+    sigmas = np.broadcast_to(np.asarray(sigma, dtype = float), (len(axes), ))
+
+    return [ (a, s) for (a, s) in zip(axes, sigmas) if s > 0 ]
+
+def _get_edge_norm(n, kernel, axis, ndim):
+    """Return fraction of the kernel weight falling inside the histogram."""
+    shape       = [ 1 ] * ndim
+    shape[axis] = n
+
+    return _convolve_axis(np.ones(n), kernel, 0).reshape(shape)
+
+def smooth_gaussian(hist, err_sq, sigma, axes = None, truncate = 4.0):
+    """Smooth histogram by a separable Gaussian kernel.
+
+    Convolutions are performed axis by axis by the overlap-add FFT method.
+    Near the histogram edges the kernel is renormalized to the part lying
+    inside the histogram, which preserves flat distributions.
+
+    Parameters
+    ----------
+    hist : ndarray
+        Histogram to smooth.
+    err_sq : ndarray or None
+        Squared errors of the histogram. Errors are propagated assuming
+        bins are uncorrelated, i.e. by convolution with the squared kernel.
+    sigma : float or list of float
+        Width of the Gaussian kernel in units of bins for each axis in
+        `axes`. Axes with zero `sigma` are not smoothed.
+    axes : list of int or None, optional
+        Axes to smooth. If None, all axes are smoothed. Default: None.
+    truncate : float, optional
+        Truncate kernel at this many sigmas. Default: 4.
+
+    Returns
+    -------
+    (hist, err_sq) : tuple of 2 ndarray
+        Smoothed histogram and its squared errors (None if `err_sq` is None).
+    """
+    for (axis, s) in _get_axes_sigmas(hist.ndim, sigma, axes):
+        kernel = get_gaussian_kernel(s, truncate)
+        norm   = _get_edge_norm(hist.shape[axis], kernel, axis, hist.ndim)
+
+        hist = _convolve_axis(hist, kernel, axis) / norm
+
+        if err_sq is not None:
+            err_sq = _convolve_axis(err_sq, kernel**2, axis) / norm**2
+            # Guard against negative FFT round-off errors
+            err_sq = np.maximum(err_sq, 0)
+
+    return (hist, err_sq)
+
+def _running_median(x, width):
+    """Running median of `x` over windows of `width` bins."""
+    return np.median(
+        np.lib.stride_tricks.sliding_window_view(x, width), axis = -1
+    )
+
+def _smooth_353(z):
+    """Apply 3, 5, 3 running medians with ROOT end point rules."""
+    # Running median of 3
+    z[1:-1] = _running_median(z, 3)
+    z[0]    = np.median([ z[1],  z[0],  3 * z[1]  - 2 * z[2]  ])
+    z[-1]   = np.median([ z[-2], z[-1], 3 * z[-2] - 2 * z[-3] ])
+
+    # Running median of 5, with median of 3 for the second points
+    y = z.copy()
+
+    if len(z) >= 5:
+        z[2:-2] = _running_median(y, 5)
+
+    z[1]  = np.median(y[:3])
+    z[-2] = np.median(y[-3:])
+
+    # Running median of 3, end points are kept
+    z[1:-1] = _running_median(z, 3)
+
+    return z
+
+def _smooth_353qh_once(x):
+    """One pass of the ROOT 353QH smoothing (c.f. TH1::SmoothArray)."""
+    z = x.copy()
+    r = None
+
+    for _ in range(2):
+        z = _smooth_353(z)
+        y = z.copy()
+
+        # Quadratic interpolation of flat segments of three points
+        tmp0 = z[:-4] - z[2:-2]
+        tmp1 = z[4:]  - z[2:-2]
+        flat = (
+              (z[1:-3] == z[2:-2]) & (z[2:-2] == z[3:-1])
+            & (tmp0 * tmp1 > 0)
+        )
+
+        for i in np.flatnonzero(flat) + 2:
+            jk = -1 if abs(tmp1[i - 2]) > abs(tmp0[i - 2]) else 1
+
+            y[i]      = (
+                -0.5 * z[i - 2*jk] + z[i] / 0.75 + z[i + 2*jk] / 6.
+            )
+            y[i + jk] = 0.5 * (z[i + 2*jk] - z[i - 2*jk]) + z[i]
+
+        # Hanning running mean
+        z[1:-1] = 0.25 * y[:-2] + 0.5 * y[1:-1] + 0.25 * y[2:]
+        z[0]    = y[0]
+        z[-1]   = y[-1]
+
+        if r is None:
+            # Smooth residuals on the second iteration
+            r = z
+            z = x - z
+
+    result = r + z
+
+    if np.min(x) >= 0:
+        result = np.maximum(result, 0)
+
+    return result
+
+def smooth_353qh(hist, n_times = 1):
+    """Smooth 1D histogram by the ROOT 353QH algorithm.
+
+    This is a port of the `TH1::SmoothArray` algorithm: running medians
+    of 3, 5 and 3 bins, quadratic interpolation of flat segments and
+    Hanning running mean, applied twice ("twicing").
+
+    Parameters
+    ----------
+    hist : ndarray, shape (N,)
+        Histogram to smooth. Must have at least 3 bins.
+    n_times : int, optional
+        Number of times to apply the smoothing. Default: 1.
+
+    Returns
+    -------
+    ndarray, shape (N,)
+        Smoothed histogram.
+    """
+    if len(hist) < 3:
+        raise ValueError(
+            "353QH smoothing requires at least 3 bins, got %d" % (len(hist))
+        )
+
+    result = np.array(hist, dtype = float)
+
+    for _ in range(n_times):
+        result = _smooth_353qh_once(result)
+
+    return result
+
+def get_uniform_bins(bins, oversample = 1):
+    """Verify that `bins` are uniform and split each bin into `oversample`."""
+    width = np.diff(bins)
+
+    if not np.allclose(width, width[0]):
+        raise ValueError("Kernel density estimates require uniform binning")
+
+    return (
+        np.linspace(bins[0], bins[-1], (len(bins) - 1) * oversample + 1),
+        width[0] / oversample
+    )
+
+def reduce_bins(hist, oversample):
+    """Sum each `oversample` consecutive bins along all axes of `hist`."""
+    shape = []
+
+    for n in hist.shape:
+        shape += [ n // oversample, oversample ]
+
+    return np.sum(hist.reshape(shape), axis = tuple(range(1, len(shape), 2)))
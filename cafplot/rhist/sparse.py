@@ -0,0 +1,359 @@
+"""
+This module contains class definition for the sparse ROOT-like histogram.
+"""
+
+import numbers
+import numpy as np
+
+from .rhist   import RHist
+from .rhist1d import RHist1D
+from .rhist2d import RHist2D
+
+def _get_bin_index(data, bins):
+    """Find bin index of each `data` point, -1 if point is out of range."""
+    index = np.searchsorted(bins, data, side = 'right') - 1
+
+    # Follow numpy convention: the last bin is closed on both ends
+    index[data == bins[-1]] = len(bins) - 2
+    index[(index < 0) | (index >= len(bins) - 1)] = -1
+
+    return index
+
+def _merge_index(index, values_list):
+    """Sum values sharing the same flat bin `index`."""
+    result_index, inverse = np.unique(index, return_inverse = True)
+
+    result_values = [
+        np.bincount(inverse, weights = values, minlength = len(result_index))
+            for values in values_list
+    ]
+
+    return (result_index, *result_values)
+
+class SparseRHist:
+    """A sparse ROOT-like histogram of arbitrary dimension
+
+    `SparseRHist` stores only filled bins of the histogram as a sorted array
+    of flat bin indices together with the histogram values and squared errors
+    of those bins. Memory and the cost of arithmetic operations scale with
+    the number of filled bins, rather than with the total number of bins.
+
+    Parameters
+    ----------
+    bins : list of ndarray
+        List of bin edges for each dimension.
+    index : ndarray of int, shape (K,)
+        Flat (C-ordered) indices of the filled bins.
+    data : ndarray, shape (K,)
+        Histogram values of the filled bins.
+    err_sq_data : ndarray, shape (K,), optional
+        Squared errors of the filled bins.
+        If not specified errors are assumed to be 0.
+
+    See Also
+    --------
+    RHist : dense ROOT-like histogram
+    """
+
+    def __init__(self, bins, index, data, err_sq_data = None):
+        self._bins  = [ np.asarray(x) for x in bins ]
+        self._shape = tuple(len(x) - 1 for x in self._bins)
+
+        index = np.asarray(index, dtype = np.int64)
+        data  = np.asarray(data)
+
+        if err_sq_data is None:
+            err_sq_data = np.zeros(data.shape)
+
+        err_sq_data = np.asarray(err_sq_data)
+
+        if (len(index) > 1) and np.any(index[1:] <= index[:-1]):
+            index, data, err_sq_data = _merge_index(index, [data, err_sq_data])
+
+        self._index       = index
+        self._data        = data
+        self._err_sq_data = err_sq_data
+
+        self._self_sanity_check()
+
+    @staticmethod
+    def from_dense(rhist):
+        """Constructs a `SparseRHist` from a dense `RHist`."""
+        filled = np.flatnonzero((rhist.hist != 0) | (rhist.err_sq != 0))
+
+        return SparseRHist(
+            rhist.bins, filled,
+            rhist.hist.ravel()[filled], rhist.err_sq.ravel()[filled]
+        )
+
+    @staticmethod
+    def from_data(data, bins, weights = None):
+        """Constructs a `SparseRHist` from the data.
+
+        Parameters
+        ----------
+        data : list of ndarray, each of shape (N,)
+            Coordinates of the data points to be binned. One array per
+            histogram dimension.
+        bins : list of ndarray
+            List of bin edges for each dimension.
+        weights : ndarray, shape (N,), optional
+            Weights associated to each data point. By default all data points
+            are weighted with equal weight of 1.
+
+        Returns
+        -------
+        SparseRHist
+            A sparse ROOT-like histogram built from the `data`.
+        """
+        bins  = [ np.asarray(x) for x in bins ]
+        shape = tuple(len(x) - 1 for x in bins)
+
+        if len(data) != len(bins):
+            raise ValueError(
+                "Data dimension %d is not equal to bins dimension %d" \
+                % (len(data), len(bins))
+            )
+
+        index_list = [
+            _get_bin_index(np.asarray(x), b) for (x, b) in zip(data, bins)
+        ]
+
+        mask = np.all([ index >= 0 for index in index_list ], axis = 0)
+        flat = np.ravel_multi_index(
+            tuple(index[mask] for index in index_list), shape
+        )
+
+        if weights is None:
+            weights = np.ones(len(mask))
+
+        weights = np.asarray(weights)[mask]
+
+        return SparseRHist(bins, *_merge_index(flat, [weights, weights**2]))
+
+    @property
+    def bins(self):
+        """ List of bin edges for each dimension """
+        return self._bins
+
+    @property
+    def shape(self):
+        """ Shape of the dense histogram """
+        return self._shape
+
+    @property
+    def ndim(self):
+        """ Number of histogram dimensions """
+        return len(self._bins)
+
+    @property
+    def nnz(self):
+        """ Number of filled bins """
+        return len(self._index)
+
+    @property
+    def index(self):
+        """ Flat indices of the filled bins """
+        return self._index
+
+    @property
+    def data(self):
+        """ Histogram values of the filled bins """
+        return self._data
+
+    @property
+    def err_sq_data(self):
+        """ Squared errors of the filled bins """
+        return self._err_sq_data
+
+    def to_dense(self):
+        """Convert histogram into a dense `RHist`.
+
+        Returns
+        -------
+        RHist1D, RHist2D or RHist
+            Dense histogram. Type of the histogram depends on `ndim`.
+        """
+        hist   = np.zeros(self._shape, dtype = self._data.dtype)
+        err_sq = np.zeros(self._shape, dtype = self._err_sq_data.dtype)
+
+        hist  .ravel()[self._index] = self._data
+        err_sq.ravel()[self._index] = self._err_sq_data
+
+        if self.ndim == 1:
+            return RHist1D(self._bins, hist, err_sq)
+        elif self.ndim == 2:
+            return RHist2D(self._bins, hist, err_sq)
+
+        return RHist(self._bins, hist, err_sq)
+
+    def project(self, axis):
+        """Project histogram on a subset of its axes.
+
+        Parameters
+        ----------
+        axis : int or tuple of int
+            Axis (axes) to be kept. All other axes are summed over.
+
+        Returns
+        -------
+        RHist1D or SparseRHist
+            If `axis` is int, then a dense `RHist1D` projection is returned.
+            Otherwise, a sparse projection on the axes `axis`.
+        """
+        axes = (axis, ) if isinstance(axis, numbers.Integral) else tuple(axis)
+
+        for ax in axes:
+            if (ax >= self.ndim) or (ax < 0):
+                raise RuntimeError(
+                    "Dimension %d exceedes histogram ndim %d" % (ax, self.ndim)
+                )
+
+        coords = np.unravel_index(self._index, self._shape)
+        bins   = [ self._bins[ax] for ax in axes ]
+        shape  = tuple(self._shape[ax] for ax in axes)
+
+        flat = np.ravel_multi_index(tuple(coords[ax] for ax in axes), shape)
+
+        if isinstance(axis, numbers.Integral):
+            hist   = np.bincount(
+                flat, weights = self._data, minlength = shape[0]
+            )
+            err_sq = np.bincount(
+                flat, weights = self._err_sq_data, minlength = shape[0]
+            )
+            return RHist1D(bins, hist, err_sq)
+
+        return SparseRHist(
+            bins, *_merge_index(flat, [self._data, self._err_sq_data])
+        )
+
+    def scale(self, factor):
+        """Scale histogram inplace by a `factor`."""
+        self._data        = factor * self._data
+        self._err_sq_data = factor**2 * self._err_sq_data
+
+    def _self_sanity_check(self):
+        for dim,bins_dim in enumerate(self._bins):
+            if len(bins_dim.shape) != 1:
+                raise RuntimeError(
+                    "Hist bins for dimension %d have invalid shape '%s'" \
+                    % (dim, bins_dim.shape)
+                )
+
+        if not (self._index.shape == self._data.shape
+                == self._err_sq_data.shape):
+            raise RuntimeError(
+                "Sparse hist index, data and error shapes are not equal"
+            )
+
+        if (len(self._index) > 0) and (
+               (self._index[0] < 0)
+            or (self._index[-1] >= np.prod(self._shape, dtype = np.int64))
+        ):
+            raise RuntimeError("Sparse hist index is out of bounds")
+
+    def _are_bins_compatible(self, other):
+        if len(self.bins) != len(other.bins):
+            return False
+
+        for dim in range(len(self.bins)):
+            if not np.array_equal(self.bins[dim], other.bins[dim]):
+                return False
+
+        return True
+
+    def _check_other(self, other):
+        if not isinstance(other, SparseRHist):
+            raise RuntimeError(
+                "Do not know how to handle binop of a SparseRHist and %s." % (
+                    type(other)
+                )
+            )
+
+        if not self._are_bins_compatible(other):
+            raise ValueError("Histograms have incompatible binnings")
+
+    def __add__(self, other):
+        # pylint: disable=protected-access
+        self._check_other(other)
+
+        return SparseRHist(self._bins, *_merge_index(
+            np.concatenate([ self._index, other._index ]),
+            [
+                np.concatenate([ self._data, other._data ]),
+                np.concatenate([ self._err_sq_data, other._err_sq_data ]),
+            ]
+        ))
+
+    def __sub__(self, other):
+        # pylint: disable=protected-access
+        self._check_other(other)
+
+        return SparseRHist(self._bins, *_merge_index(
+            np.concatenate([ self._index, other._index ]),
+            [
+                np.concatenate([ self._data, -other._data ]),
+                np.concatenate([ self._err_sq_data, other._err_sq_data ]),
+            ]
+        ))
+
+    def __mul__(self, other):
+        # pylint: disable=protected-access
+        if isinstance(other, numbers.Number):
+            return SparseRHist(
+                self._bins, self._index,
+                other * self._data, other**2 * self._err_sq_data
+            )
+
+        self._check_other(other)
+
+        index, idx_self, idx_other = np.intersect1d(
+            self._index, other._index,
+            assume_unique = True, return_indices = True
+        )
+
+        a, a_err_sq = self._data[idx_self], self._err_sq_data[idx_self]
+        b, b_err_sq = other._data[idx_other], other._err_sq_data[idx_other]
+
+        return SparseRHist(
+            self._bins, index, a * b, b**2 * a_err_sq + a**2 * b_err_sq
+        )
+
+    def __rmul__(self, other):
+        if isinstance(other, numbers.Number):
+            return self.__mul__(other)
+
+        return NotImplemented
+
+    def __truediv__(self, other):
+        """Divide histograms.
+
+        Division is performed only for the bins filled in both `self` and
+        `other`, where `other` is not zero. All other bins are left unfilled
+        in the result, i.e. division by empty bins of the denominator does
+        not produce inf or nan values.
+        """
+        # pylint: disable=protected-access
+        if isinstance(other, numbers.Number):
+            return self.__mul__(1 / other)
+
+        self._check_other(other)
+
+        index, idx_self, idx_other = np.intersect1d(
+            self._index, other._index,
+            assume_unique = True, return_indices = True
+        )
+
+        nonzero   = (other._data[idx_other] != 0)
+        index     = index[nonzero]
+        idx_self  = idx_self[nonzero]
+        idx_other = idx_other[nonzero]
+
+        a, a_err_sq = self._data[idx_self], self._err_sq_data[idx_self]
+        b, b_err_sq = other._data[idx_other], other._err_sq_data[idx_other]
+
+        data   = a / b
+        err_sq = (1 / b)**2 * a_err_sq + (a / b**2)**2 * b_err_sq
+
+        return SparseRHist(self._bins, index, data, err_sq)
@@ -2,7 +2,8 @@
 This module contains classes corresponding to the CAFAna Spectrum.
 """
 
+from .interp   import SpectrumInterp
 from .spectrum import Spectrum
 
-__all__ = [ 'Spectrum' ]
+__all__ = [ 'Spectrum', 'SpectrumInterp' ]
 
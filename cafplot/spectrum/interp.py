@@ -0,0 +1,126 @@
+"""
+This module defines interpolation of spectra across systematic shifts.
+"""
+
+import numpy as np
+from scipy.interpolate import CubicSpline
+
+from .spectrum import Spectrum
+
+def _get_hist(spectrum, pot, livetime):
+    if isinstance(spectrum, Spectrum):
+        return spectrum.rhist(pot, livetime).hist
+
+    return spectrum.hist
+
+class SpectrumInterp:
+    """Interpolation of spectra across systematic shifts.
+
+    This object is similar to the CAFAna PredictionInterp. For each
+    systematic knob it takes spectra shifted by several sigmas and
+    precomputes cubic spline coefficients of the ratios of shifted spectra to
+    the nominal one in each bin. Predicted spectra are then evaluated as
+    the nominal spectrum multiplied by the interpolated ratios of all knobs.
+
+    Parameters
+    ----------
+    nominal : Spectrum or RHist
+        Nominal (unshifted) spectrum.
+    shifts : dict of { str : dict of { float : Spectrum or RHist } }
+        Dictionary of shifted spectra for each systematic knob. Shifted
+        spectra of each knob are keyed by the shift in sigmas, e.g.
+        { 'xsec' : { -1 : spec_m1, 1 : spec_p1 } }.
+    pot : float or None, optional
+        POT value to normalize spectra to. If both `pot` and `livetime` are
+        None and `nominal` is Spectrum, then the nominal POT (or livetime) is
+        used.
+    livetime : float or None, optional
+        Livetime value to normalize spectra to.
+    """
+
+    def __init__(self, nominal, shifts, pot = None, livetime = None):
+        if (
+                isinstance(nominal, Spectrum)
+            and (pot is None) and (livetime is None)
+        ):
+            pot, livetime = nominal.pot, nominal.livetime
+
+            if (pot is not None) and (livetime is not None):
+                livetime = None
+
+        self._nominal = _get_hist(nominal, pot, livetime)
+        self._knobs   = list(shifts.keys())
+        self._splines = []
+
+        nominal_flat = self._nominal.ravel()
+        nonzero      = (nominal_flat != 0)
+
+        for knob in self._knobs:
+            knob_shifts = dict(shifts[knob])
+            knob_shifts.setdefault(0, nominal)
+
+            sigmas = np.array(sorted(knob_shifts.keys()), dtype = float)
+            ratios = np.ones((len(sigmas), len(nominal_flat)))
+
+            for (idx, sigma) in enumerate(sigmas):
+                hist = _get_hist(knob_shifts[sigma], pot, livetime).ravel()
+                ratios[idx, nonzero] = hist[nonzero] / nominal_flat[nonzero]
+
+            spline = CubicSpline(sigmas, ratios, axis = 0)
+
+            # Spline coefficients of shape (4, n_segments, n_bins)
+            self._splines.append((sigmas, spline.c))
+
+    @property
+    def knobs(self):
+        """List of systematic knob names."""
+        return self._knobs
+
+    @property
+    def nominal(self):
+        """Nominal histogram."""
+        return self._nominal
+
+    def predict(self, shifts):
+        """Evaluate predicted spectra for a batch of knob shifts.
+
+        Parameters
+        ----------
+        shifts : ndarray, shape (n_points, n_knobs) or (n_knobs,)
+            Shifts of each systematic knob in sigmas. Knobs are ordered
+            as `knobs`.
+
+        Returns
+        -------
+        ndarray, shape (n_points, ...) or (...)
+            Predicted histograms for each point.
+        """
+        shifts = np.asarray(shifts, dtype = float)
+        single = (shifts.ndim == 1)
+        shifts = np.atleast_2d(shifts)
+
+        if shifts.shape[1] != len(self._knobs):
+            raise ValueError(
+                "Number of shifts %d is not equal to number of knobs %d" \
+                % (shifts.shape[1], len(self._knobs))
+            )
+
+        result = np.tile(self._nominal.ravel(), (len(shifts), 1))
+
+        for (knob, (sigmas, coeffs)) in enumerate(self._splines):
+            s   = shifts[:, knob]
+            seg = np.clip(
+                np.searchsorted(sigmas, s, side = 'right') - 1,
+                0, len(sigmas) - 2
+            )
+            dx = (s - sigmas[seg])[:, np.newaxis]
+            c  = coeffs[:, seg, :]
+
+            result *= ((c[0] * dx + c[1]) * dx + c[2]) * dx + c[3]
+
+        result = result.reshape((len(shifts), ) + self._nominal.shape)
+
+        if single:
+            return result[0]
+
+        return result
@@ -25,6 +25,16 @@ class Spectrum:
         self._pot   = pot
         self._lt    = livetime
 
+    @property
+    def pot(self):
+        """POT value of the spectrum or None."""
+        return self._pot
+
+    @property
+    def livetime(self):
+        """Livetime value of the spectrum or None."""
+        return self._lt
+
     def rhist(self, pot = None, livetime = None):
         """Get normalized histogram from the spectrum.
 
@@ -61,6 +71,29 @@ class Spectrum:
 
         return result
 
+    def toys(self, n_toys, pot = None, livetime = None, seed = None, **kwargs):
+        """Generate a batch of Poisson fluctuations of the normalized spectrum.
+
+        Parameters
+        ----------
+        n_toys : int
+            Number of toys to generate.
+        pot : float or None, optional
+            POT value to normalize spectrum to, c.f. `rhist`.
+        livetime : float or None, optional
+            Livetime value to normalize spectrum to, c.f. `rhist`.
+        seed : int or SeedSequence or None, optional
+            Seed of the random streams. Default: None.
+        kwargs : dict, optional
+            Additional parameters to pass to `generate_poisson_toys`.
+
+        Returns
+        -------
+        ndarray, shape (n_toys, ...)
+            Toys stored as a single array.
+        """
+        return self.rhist(pot, livetime).toys(n_toys, seed, **kwargs)
+
     def _check_other(self, other):
         """Verify binary operation is possible between `self` and `other`."""
         # pylint: disable=protected-access
@@ -2,11 +2,25 @@
 This module contains various statistical helper functions
 """
 
-from .stats import gauss_sigma_to_prob, get_poisson_confidence_interval
-from .hist  import get_histogram_statistics
+from .stats      import (
+    gauss_sigma_to_prob, get_poisson_confidence_interval,
+    get_clopper_pearson_interval, get_bayesian_interval, get_wilson_interval
+)
+from .gof        import GOF_DTYPE, compare_histograms
+from .hist       import (
+    get_histogram_statistics, get_histogram_moments, get_histogram_quantiles,
+    get_histogram_cdf, get_cdf_quantiles
+)
+from .likelihood import get_gauss_chi2, get_poisson_chi2
+from .toys       import generate_poisson_toys, iter_poisson_toys, spawn_seeds
 
 __all__ = [
     'gauss_sigma_to_prob', 'get_poisson_confidence_interval',
-    'get_histogram_statistics'
+    'get_clopper_pearson_interval', 'get_bayesian_interval',
+    'get_wilson_interval',
+    'GOF_DTYPE', 'compare_histograms',
+    'get_histogram_statistics', 'get_histogram_moments',
+    'get_histogram_quantiles', 'get_histogram_cdf', 'get_cdf_quantiles',
+    'get_gauss_chi2', 'get_poisson_chi2',
+    'generate_poisson_toys', 'iter_poisson_toys', 'spawn_seeds'
 ]
-
@@ -0,0 +1,268 @@
+"""
+This module contains vectorized goodness-of-fit tests of binned histograms.
+"""
+
+import numpy as np
+import scipy.stats
+
+GOF_DTYPE = np.dtype([
+    ('chi2',      float),
+    ('ndf',       int),
+    ('chi2_prob', float),
+    ('ks',        float),
+    ('ks_prob',   float),
+    ('ad',        float),
+    ('ad_prob',   float),
+])
+
+# Critical values of the standardized k-sample Anderson-Darling statistic
+# for k = 2 (Scholz and Stephens, Table 1)
+_AD_SIG_LEVELS = np.array([ 0.25, 0.1, 0.05, 0.025, 0.01, 0.005, 0.001 ])
+_AD_CRIT_2SAMP = (
+      np.array([  0.675,  1.281,  1.645,  1.960,  2.326,  2.573,  3.085 ])
+    + np.array([ -0.245,  0.250,  0.678,  1.149,  1.822,  2.364,  3.615 ])
+    + np.array([ -0.105, -0.305, -0.362, -0.391, -0.396, -0.345, -0.154 ])
+)
+_AD_LOG_SIG_POLY = np.polyfit(_AD_CRIT_2SAMP, np.log(_AD_SIG_LEVELS), 2)
+
+def _get_hist_data(hist, err_sq):
+    """Coerce RHist, list of RHist or ndarray into (hist, err_sq, bins)."""
+    if hasattr(hist, 'hist'):
+        hist = [ hist, ]
+
+    if isinstance(hist, (list, tuple)) and hasattr(hist[0], 'hist'):
+        bins = hist[0].bins
+
+        for rhist in hist[1:]:
+            # pylint: disable=protected-access
+            if not hist[0]._are_bins_compatible(rhist):
+                raise ValueError("Histograms have incompatible binnings")
+
+        err_sq = np.stack([ x.err_sq.ravel() for x in hist ])
+        hist   = np.stack([ x.hist.ravel()   for x in hist ])
+
+        return (hist, err_sq, bins)
+
+    hist = np.asarray(hist, dtype = float)
+
+    if err_sq is None:
+        err_sq = hist
+    else:
+        err_sq = np.asarray(err_sq, dtype = float)
+
+    return (hist, err_sq, None)
+
+def _get_effective_entries(hist, err_sq):
+    """Calculate effective number of entries (sum w)^2 / (sum w^2)."""
+    total    = np.sum(hist,   axis = -1)
+    total_sq = np.sum(err_sq, axis = -1)
+
+    return np.divide(
+        total**2, total_sq, out = np.full(total.shape, np.inf),
+        where = (total_sq > 0)
+    )
+
+def _chi2_test(hist_a, err_sq_a, hist_b, err_sq_b, normalize):
+    if normalize:
+        sum_a = np.sum(hist_a, axis = -1, keepdims = True)
+        sum_b = np.sum(hist_b, axis = -1, keepdims = True)
+        norm  = np.divide(
+            sum_a, sum_b, out = np.zeros(np.broadcast(sum_a, sum_b).shape),
+            where = (sum_b != 0)
+        )
+    else:
+        norm = 1
+
+    denom = err_sq_a + norm**2 * err_sq_b
+    mask  = (denom > 0)
+    chi2  = np.sum(
+        np.divide(
+            (hist_a - norm * hist_b)**2, denom,
+            out = np.zeros(mask.shape), where = mask
+        ),
+        axis = -1
+    )
+
+    ndf = np.sum(mask, axis = -1) - int(normalize)
+    ndf = np.maximum(ndf, 0)
+
+    prob = np.where(ndf > 0, scipy.stats.chi2.sf(chi2, np.maximum(ndf, 1)), 1)
+
+    return (chi2, ndf, prob)
+
+def _get_cdf(hist):
+    cdf   = np.cumsum(hist, axis = -1)
+    total = cdf[..., -1:]
+
+    return np.divide(
+        cdf, total, out = np.zeros(cdf.shape), where = (total != 0)
+    )
+
+def _ks_test(hist_a, hist_b, n_eff_a, n_eff_b):
+    dist  = np.max(np.abs(_get_cdf(hist_a) - _get_cdf(hist_b)), axis = -1)
+    n_eff = 1 / (1 / n_eff_a + 1 / n_eff_b)
+
+    # Stephens correction for the finite number of entries
+    sqrt_n = np.sqrt(n_eff)
+
+    with np.errstate(invalid = 'ignore'):
+        prob = scipy.stats.kstwobign.sf((sqrt_n + 0.12 + 0.11 / sqrt_n) * dist)
+
+    return (dist, prob)
+
+def _scale_to_entries(hist, n_eff):
+    """Scale histograms, such that the total is equal to entries `n_eff`."""
+    total = np.sum(hist, axis = -1, keepdims = True)
+    n_eff = np.asarray(n_eff)[..., np.newaxis]
+
+    scale = np.divide(
+        n_eff, total, out = np.ones(np.broadcast(n_eff, total).shape),
+        where = (total > 0) & np.isfinite(n_eff)
+    )
+
+    return hist * scale
+
+def _ad_test(hist_a, hist_b, n_eff_a, n_eff_b):
+    """Binned two-sample Anderson-Darling test for data with ties.
+
+    The statistic is the midrank version A^2_akN of Scholz and Stephens [1]_,
+    where each bin forms a group of tied observations. Histograms are scaled
+    to their effective numbers of entries.
+
+    References
+    ----------
+    [1] F. W. Scholz and M. A. Stephens, J. Amer. Stat. Assoc. 82 (1987) 918.
+    """
+    samples = np.broadcast_arrays(
+        _scale_to_entries(hist_a, n_eff_a), _scale_to_entries(hist_b, n_eff_b)
+    )
+
+    n_i   = [ np.sum(f, axis = -1, keepdims = True) for f in samples ]
+    n_tot = n_i[0] + n_i[1]
+    l_j   = samples[0] + samples[1]
+    b_j   = np.cumsum(l_j, axis = -1) - l_j / 2
+
+    denom = b_j * (n_tot - b_j) - n_tot * l_j / 4
+    mask  = (l_j > 0) & (denom > 0)
+    stat  = 0
+
+    for (f_ij, n) in zip(samples, n_i):
+        m_ij  = np.cumsum(f_ij, axis = -1) - f_ij / 2
+        inner = np.divide(
+            l_j / n_tot * (n_tot * m_ij - n * b_j)**2, denom,
+            out = np.zeros(denom.shape), where = mask
+        )
+        stat += np.divide(
+            np.sum(inner, axis = -1), n[..., 0],
+            out = np.zeros(inner.shape[:-1]), where = (n[..., 0] > 0)
+        )
+
+    n_tot = n_tot[..., 0]
+    stat *= np.divide(
+        n_tot - 1, n_tot, out = np.zeros(n_tot.shape), where = (n_tot > 0)
+    )
+
+    # Asymptotic variance of A^2_akN for k = 2 samples
+    g   = np.pi**2 / 6
+    h   = sum(
+        np.divide(1, n[..., 0], out = np.zeros(n_tot.shape),
+                  where = (n[..., 0] > 0))
+        for n in n_i
+    )
+    var = (4 * g - 6) + (10 - 6 * g) * h
+
+    stat_std = (stat - 1) / np.sqrt(var)
+
+    # The fit is valid only within the table, hence the statistic is clipped
+    # to the table range and p-values are limited to [0.001, 0.25], as in
+    # `scipy.stats.anderson_ksamp`
+    prob = np.exp(np.polyval(
+        _AD_LOG_SIG_POLY,
+        np.clip(stat_std, _AD_CRIT_2SAMP[0], _AD_CRIT_2SAMP[-1])
+    ))
+    prob = np.clip(prob, _AD_SIG_LEVELS[-1], _AD_SIG_LEVELS[0])
+
+    return (stat_std, prob)
+
+def compare_histograms(
+    hist_a, hist_b, err_sq_a = None, err_sq_b = None, normalize = True
+):
+    """Run goodness-of-fit tests on many pairs of histograms at once.
+
+    This function compares histograms `hist_a` and `hist_b` pairwise with
+    chi^2, binned Kolmogorov-Smirnov and binned two-sample Anderson-Darling
+    tests. All tests are vectorized over the pairs of histograms.
+
+    Parameters
+    ----------
+    hist_a : RHist or list of RHist or ndarray, shape (..., n_bins)
+        First histograms to compare. If ndarray, the last axis enumerates
+        bins and the leading axes enumerate histograms.
+    hist_b : RHist or list of RHist or ndarray, shape (..., n_bins)
+        Second histograms to compare. Must be broadcastable to `hist_a`,
+        e.g. a single reference histogram can be compared to a stack.
+    err_sq_a : ndarray or None, optional
+        Squared errors of `hist_a` when `hist_a` is ndarray. If None,
+        Poisson errors are assumed. Default: None.
+    err_sq_b : ndarray or None, optional
+        Squared errors of `hist_b` when `hist_b` is ndarray. If None,
+        Poisson errors are assumed. Default: None.
+    normalize : bool, optional
+        If True, then the chi^2 test compares histogram shapes, i.e. `hist_b`
+        is normalized to the integral of `hist_a` and the number of degrees
+        of freedom is reduced by one. Default: True.
+
+    Returns
+    -------
+    ndarray of GOF_DTYPE
+        Structured array of test results for each pair with fields 'chi2',
+        'ndf', 'chi2_prob', 'ks', 'ks_prob', 'ad' and 'ad_prob'.
+        'ad' is the standardized Anderson-Darling statistic. The array can be
+        sorted by any test, e.g. `np.sort(result, order = 'ks_prob')`.
+
+    Notes
+    -----
+    KS and AD tests treat histogram bins as ordered, hence multidimensional
+    histograms are compared in the order of their flattened bins. Both tests
+    use effective numbers of entries (sum w)^2 / (sum w^2) of the histograms.
+    AD p-values are interpolated from the table of critical values, hence
+    they are limited to the range [0.001, 0.25].
+
+    Examples
+    --------
+    >>> result = compare_histograms(
+    ...     np.array([ 100, 200, 300, 200, 100 ]),
+    ...     3 * np.array([ 300, 200, 100, 50, 10 ])
+    ... )
+    >>> round(float(result['ad_prob']), 3)
+    0.001
+    """
+    hist_a, err_sq_a, bins_a = _get_hist_data(hist_a, err_sq_a)
+    hist_b, err_sq_b, bins_b = _get_hist_data(hist_b, err_sq_b)
+
+    if (bins_a is not None) and (bins_b is not None):
+        if (len(bins_a) != len(bins_b)) or not all(
+            np.array_equal(x, y) for (x, y) in zip(bins_a, bins_b)
+        ):
+            raise ValueError("Histograms have incompatible binnings")
+
+    n_eff_a = _get_effective_entries(hist_a, err_sq_a)
+    n_eff_b = _get_effective_entries(hist_b, err_sq_b)
+
+    chi2, ndf, chi2_prob = _chi2_test(
+        hist_a, err_sq_a, hist_b, err_sq_b, normalize
+    )
+    ks, ks_prob = _ks_test(hist_a, hist_b, n_eff_a, n_eff_b)
+    ad, ad_prob = _ad_test(hist_a, hist_b, n_eff_a, n_eff_b)
+
+    result = np.empty(np.shape(chi2), dtype = GOF_DTYPE)
+
+    result['chi2']      = chi2
+    result['ndf']       = ndf
+    result['chi2_prob'] = chi2_prob
+    result['ks']        = ks
+    result['ks_prob']   = ks_prob
+    result['ad']        = ad
+    result['ad_prob']   = ad_prob
+
+    return result
@@ -4,6 +4,8 @@ A collection of function to calculate statistical properties of histograms
 
 import numpy as np
 
+STATS = ( 'integral', 'mean', 'rms', 'stdev', 'skewness' )
+
 def get_mean(data, weights):
     """Calculate mean of a weighted data."""
     return np.sum(data * weights)
@@ -17,6 +19,172 @@ def get_stdev(data, weights):
     mean = get_mean(data, weights)
     return np.sum((data - mean)**2 * weights)
 
+def get_histogram_cdf(hist, axis = -1):
+    """Calculate normalized cumulative distribution of a histogram.
+
+    Parameters
+    ----------
+    hist : ndarray, shape (..., N, ...)
+        Histogram (or a batch of histograms) with non-negative values.
+    axis : int, optional
+        Histogram axis. Default: -1.
+
+    Returns
+    -------
+    ndarray, shape (..., N+1, ...)
+        Values of the cumulative distribution at the bin edges along `axis`.
+        Cumulative distributions of empty histograms are zeros.
+    """
+    hist = np.moveaxis(np.asarray(hist, dtype = float), axis, -1)
+
+    cdf = np.zeros(hist.shape[:-1] + (hist.shape[-1] + 1, ))
+    np.cumsum(hist, axis = -1, out = cdf[..., 1:])
+
+    total = cdf[..., -1:].copy()
+    np.divide(cdf, total, out = cdf, where = (total > 0))
+    cdf[(total <= 0)[..., 0]] = 0
+
+    return np.moveaxis(cdf, -1, axis)
+
+def get_cdf_quantiles(cdf, bins, q, axis = -1):
+    """Calculate quantiles from cumulative distributions of histograms.
+
+    Quantiles are found by linear interpolation of the cumulative
+    distributions inside bins.
+
+    Parameters
+    ----------
+    cdf : ndarray, shape (..., N+1, ...)
+        Cumulative distributions at the bin edges, c.f. `get_histogram_cdf`.
+    bins : ndarray, shape (N+1,)
+        Bin edges along `axis`.
+    q : float or array_like of float, shape (Q,)
+        Probability levels in [0, 1].
+    axis : int, optional
+        Cumulative distribution axis. Default: -1.
+
+    Returns
+    -------
+    ndarray
+        Quantiles of shape (...,) if `q` is float, or (..., Q) otherwise,
+        where (...) are the batch dimensions of `cdf`. Quantiles of empty
+        histograms are NaN.
+    """
+    cdf = np.moveaxis(np.asarray(cdf, dtype = float), axis, -1)
+    q   = np.asarray(q, dtype = float)
+
+    batch_shape = cdf.shape[:-1]
+    cdf         = cdf.reshape((-1, cdf.shape[-1]))
+    n_batch     = cdf.shape[0]
+    n_edges     = cdf.shape[1]
+    empty       = (cdf[:, -1] <= 0)
+
+    # Offset cdf of each histogram to search all of them in a single call
+    rows   = np.arange(n_batch)[:, np.newaxis]
+    levels = np.atleast_1d(q)[np.newaxis, :]
+
+    idx = np.searchsorted(
+        (cdf + 2 * rows).ravel(), (levels + 2 * rows).ravel()
+    )
+    idx = idx.reshape((n_batch, -1)) - n_edges * rows
+    idx = np.clip(idx, 1, n_edges - 1)
+
+    cdf_low  = np.take_along_axis(cdf, idx - 1, axis = -1)
+    cdf_high = np.take_along_axis(cdf, idx,     axis = -1)
+    denom    = cdf_high - cdf_low
+
+    frac = np.divide(
+        levels - cdf_low, denom,
+        out = np.zeros(denom.shape), where = (denom > 0)
+    )
+    frac = np.clip(frac, 0, 1)
+
+    result = bins[idx - 1] + frac * (bins[idx] - bins[idx - 1])
+    result[empty] = np.nan
+
+    if q.ndim == 0:
+        return result[:, 0].reshape(batch_shape)
+
+    return result.reshape(batch_shape + (-1, ))
+
+def get_histogram_quantiles(hist, bins, q, axis = -1):
+    """Calculate histogram quantiles with linear interpolation inside bins.
+
+    Parameters
+    ----------
+    hist : ndarray, shape (..., N, ...)
+        Histogram (or a batch of histograms) with non-negative values.
+    bins : ndarray, shape (N+1,)
+        Bin edges along `axis`.
+    q : float or array_like of float, shape (Q,)
+        Probability levels in [0, 1].
+    axis : int, optional
+        Histogram axis. Default: -1.
+
+    Returns
+    -------
+    ndarray
+        Quantiles of shape (...,) if `q` is float, or (..., Q) otherwise,
+        where (...) are the batch dimensions of `hist`.
+
+    See Also
+    --------
+    get_cdf_quantiles : performs the actual calculation
+    """
+    return get_cdf_quantiles(get_histogram_cdf(hist, axis), bins, q, axis)
+
+def get_histogram_moments(hist, bins, axis = -1, quantiles = None):
+    """Calculate all statistical properties of a histogram at once.
+
+    This function calculates histogram integral, mean, rms, standard
+    deviation, skewness and, optionally, quantiles in a single call, sharing
+    bin centers and density between all statistics. Unlike the legacy
+    `get_histogram_statistics`, values of 'rms' and 'stdev' are the root
+    mean square and the standard deviation.
+
+    Parameters
+    ----------
+    hist : ndarray, shape (..., N, ...)
+        Histogram (or a batch of histograms stored as a single array).
+    bins : ndarray, shape (N+1,)
+        Bin edges along `axis`.
+    axis : int, optional
+        Histogram axis. Default: -1.
+    quantiles : array_like of float or None, optional
+        Probability levels of quantiles to calculate. Default: None.
+
+    Returns
+    -------
+    dict
+        Dictionary with keys `STATS` and, if `quantiles` is not None,
+        'quantiles'. Values are arrays of shape (...,) (or (..., Q) for
+        'quantiles'), where (...) are the batch dimensions of `hist`.
+    """
+    hist = np.moveaxis(np.asarray(hist), axis, -1)
+
+    bin_centers = (bins[:-1] + bins[1:]) / 2
+    integral    = np.sum(hist, axis = -1)
+    density     = hist / integral[..., np.newaxis]
+
+    mean = np.sum(bin_centers * density, axis = -1)
+    dev  = bin_centers - mean[..., np.newaxis]
+
+    var   = np.sum(dev**2 * density, axis = -1)
+    stdev = np.sqrt(var)
+
+    result = {
+        'integral' : integral,
+        'mean'     : mean,
+        'rms'      : np.sqrt(var + mean**2),
+        'stdev'    : stdev,
+        'skewness' : np.sum(dev**3 * density, axis = -1) / stdev**3,
+    }
+
+    if quantiles is not None:
+        result['quantiles'] = get_histogram_quantiles(hist, bins, quantiles)
+
+    return result
+
 def get_histogram_statistics(hist, bins, stat):
     """Calculate histogram statistical property `stat`
 
@@ -33,6 +201,10 @@ def get_histogram_statistics(hist, bins, stat):
     -------
     float
         Value of a statistical property `stat` for the histogram `hist`
+
+    See Also
+    --------
+    get_histogram_moments : calculates all statistics at once
     """
     bin_centers = (bins[:-1] + bins[1:]) / 2
     density     = hist / np.sum(hist)
@@ -45,4 +217,3 @@ def get_histogram_statistics(hist, bins, stat):
         return get_stdev(bin_centers, density)
     else:
         raise ValueError("Unknown statistics: %s" % (stat))
-
@@ -0,0 +1,68 @@
+"""
+This module contains vectorized binned likelihood functions.
+"""
+
+import numpy as np
+
+def get_poisson_chi2(data, pred, axis = -1):
+    """Calculate Poisson log-likelihood ratio chi^2 of the binned data.
+
+    The chi^2 is calculated following Baker and Cousins [1]_:
+        chi^2 = 2 * sum(pred - data + data * ln(data / pred))
+
+    Parameters
+    ----------
+    data : ndarray
+        Observed bin counts.
+    pred : ndarray
+        Predicted bin counts. `data` and `pred` must be broadcastable to
+        each other, which allows to evaluate many predictions (or many
+        datasets) at once.
+    axis : int or tuple of int or None, optional
+        Histogram bin axis (axes) to sum over. Default: -1.
+
+    Returns
+    -------
+    ndarray
+        Poisson chi^2 values.
+
+    References
+    ----------
+    [1] S. Baker and R. D. Cousins, Nucl. Instrum. Meth. 221 (1984) 437.
+    """
+    data = np.asarray(data, dtype = float)
+    pred = np.asarray(pred, dtype = float)
+
+    with np.errstate(divide = 'ignore', invalid = 'ignore'):
+        log_term = np.where(data > 0, data * np.log(data / pred), 0)
+
+    return 2 * np.sum(pred - data + log_term, axis = axis)
+
+def get_gauss_chi2(data, pred, err_sq, axis = -1):
+    """Calculate Gaussian chi^2 of the binned data.
+
+    Parameters
+    ----------
+    data : ndarray
+        Observed bin values.
+    pred : ndarray
+        Predicted bin values, broadcastable to `data`.
+    err_sq : ndarray
+        Squared errors of the bin values, broadcastable to `data`.
+        Bins with zero errors are ignored.
+    axis : int or tuple of int or None, optional
+        Histogram bin axis (axes) to sum over. Default: -1.
+
+    Returns
+    -------
+    ndarray
+        Gaussian chi^2 values.
+    """
+    resid_sq = (np.asarray(data) - np.asarray(pred))**2
+    err_sq   = np.broadcast_to(err_sq, resid_sq.shape)
+
+    chi2 = np.divide(
+        resid_sq, err_sq, out = np.zeros(resid_sq.shape), where = (err_sq > 0)
+    )
+
+    return np.sum(chi2, axis = axis)
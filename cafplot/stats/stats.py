@@ -2,8 +2,15 @@
 This module contains functions for working with statistical distributions.
 """
 
+import functools
+
+import numpy as np
+import scipy.special as sc
 import scipy.stats as ss
 
+POISSON_TABLE_SIZE = 1024
+"""Number of integer counts for which Poisson intervals are memoized."""
+
 def gauss_sigma_to_prob(sigma):
     """Convert significance in terms of Gaussian sigma to probability.
 
@@ -17,6 +24,33 @@ def gauss_sigma_to_prob(sigma):
 
     return ss.norm.cdf(sigma, 0, 1) - ss.norm.cdf(-sigma, 0, 1)
 
+def _calc_poisson_confidence_interval(x, prob):
+    """Calculate Poisson confidence interval for an array of observations."""
+    alpha = 1 - prob
+
+    low  = np.zeros(x.shape)
+    high = ss.gamma.isf(alpha/2, x + 1)
+
+    nonzero = (x != 0)
+    low[nonzero] = ss.gamma.isf(1 - alpha/2, x[nonzero])
+
+    return (low, high)
+
+@functools.lru_cache(maxsize = 16)
+def _get_poisson_confidence_table(prob):
+    """Return Poisson confidence intervals for the first integer counts.
+
+    The table is memoized for each `prob`, so that the confidence intervals
+    for the commonly used confidence levels are calculated only once.
+    """
+    counts = np.arange(POISSON_TABLE_SIZE, dtype = float)
+    low, high = _calc_poisson_confidence_interval(counts, prob)
+
+    low .setflags(write = False)
+    high.setflags(write = False)
+
+    return (low, high)
+
 def get_poisson_confidence_interval(x, prob):
     """Return Poisson confidence interval.
 
@@ -24,17 +58,162 @@ def get_poisson_confidence_interval(x, prob):
     mean of the Poisson distribution based on an observation `x`.
     The expression is taken from [1]_.
 
+    Confidence intervals for integer observations below
+    `POISSON_TABLE_SIZE` are looked up from a memoized table. All other
+    intervals are calculated directly.
+
+    Parameters
+    ----------
+    x : float or ndarray
+        Observation(s).
+    prob : float
+        Confidence level of the interval.
+
+    Returns
+    -------
+    (low, high) : tuple of 2 float or tuple of 2 ndarray
+        Lower and upper ends of the confidence interval. Have the same shape
+        as `x`.
+
     References
     ----------
     [1] https://en.wikipedia.org/wiki/Poisson_distribution#Confidence_interval
     """
+    x = np.asarray(x, dtype = float)
+
+    low  = np.empty(x.shape)
+    high = np.empty(x.shape)
+
+    in_table = (x >= 0) & (x < POISSON_TABLE_SIZE) & (x == np.floor(x))
+
+    if np.any(in_table):
+        table_low, table_high = _get_poisson_confidence_table(float(prob))
+        counts = x[in_table].astype(int)
+
+        low [in_table] = table_low [counts]
+        high[in_table] = table_high[counts]
 
-    if x == 0:
-        low = 0
-    else:
-        low = ss.gamma.isf(1 - prob/2, x)
+    if not np.all(in_table):
+        low[~in_table], high[~in_table] = \
+            _calc_poisson_confidence_interval(x[~in_table], prob)
 
-    high = ss.gamma.isf(prob/2, x + 1)
+    if x.ndim == 0:
+        return (float(low), float(high))
 
     return (low, high)
 
+def _beta_central_interval(a, b, prob):
+    """Return central `prob` interval of Beta(a, b) distributions."""
+    alpha = 1 - prob
+    return (sc.betaincinv(a, b, alpha / 2), sc.betaincinv(a, b, 1 - alpha / 2))
+
+def get_clopper_pearson_interval(passed, total, prob):
+    """Return Clopper-Pearson confidence interval for binomial efficiency.
+
+    Parameters
+    ----------
+    passed : ndarray
+        Number of events passed selection.
+    total : ndarray
+        Total number of events.
+    prob : float
+        Confidence level of the interval.
+
+    Returns
+    -------
+    (low, high) : tuple of 2 ndarray
+        Lower and upper ends of the confidence interval.
+        Interval is [0, 1] where `total` is 0.
+
+    References
+    ----------
+    [1] https://en.wikipedia.org/wiki/Binomial_proportion_confidence_interval
+    """
+    passed = np.asarray(passed, dtype = float)
+    total  = np.asarray(total,  dtype = float)
+
+    # Substitute degenerate Beta parameters, these ends are fixed below
+    low,  _ = _beta_central_interval(
+        np.maximum(passed, 1), total - passed + 1, prob
+    )
+    _, high = _beta_central_interval(
+        passed + 1, np.maximum(total - passed, 1), prob
+    )
+
+    low  = np.where(passed <= 0,     0, low)
+    high = np.where(passed >= total, 1, high)
+
+    return (low, high)
+
+def get_bayesian_interval(passed, total, prob, alpha = 1, beta = 1):
+    """Return Bayesian central confidence interval for binomial efficiency.
+
+    The interval is a central interval of the Beta posterior distribution
+    obtained with the Beta(`alpha`, `beta`) prior. By default a uniform prior
+    is used.
+
+    Parameters
+    ----------
+    passed : ndarray
+        Number of events passed selection.
+    total : ndarray
+        Total number of events.
+    prob : float
+        Confidence level of the interval.
+    alpha : float, optional
+        First parameter of the Beta prior. Default: 1.
+    beta : float, optional
+        Second parameter of the Beta prior. Default: 1.
+
+    Returns
+    -------
+    (low, high) : tuple of 2 ndarray
+        Lower and upper ends of the confidence interval.
+    """
+    passed = np.asarray(passed, dtype = float)
+    total  = np.asarray(total,  dtype = float)
+
+    return _beta_central_interval(
+        passed + alpha, total - passed + beta, prob
+    )
+
+def get_wilson_interval(passed, total, prob):
+    """Return Wilson score confidence interval for binomial efficiency.
+
+    Parameters
+    ----------
+    passed : ndarray
+        Number of events passed selection.
+    total : ndarray
+        Total number of events.
+    prob : float
+        Confidence level of the interval.
+
+    Returns
+    -------
+    (low, high) : tuple of 2 ndarray
+        Lower and upper ends of the confidence interval.
+        Interval is [0, 1] where `total` is 0.
+
+    References
+    ----------
+    [1] https://en.wikipedia.org/wiki/Binomial_proportion_confidence_interval
+    """
+    passed = np.asarray(passed, dtype = float)
+    total  = np.asarray(total,  dtype = float)
+
+    z       = ss.norm.isf((1 - prob) / 2)
+    nonzero = (total > 0)
+    n       = np.where(nonzero, total, 1)
+    eff     = passed / n
+
+    denom  = 1 + z**2 / n
+    center = (eff + z**2 / (2 * n)) / denom
+    margin = z * np.sqrt(
+        np.maximum(eff * (1 - eff), 0) / n + z**2 / (4 * n**2)
+    ) / denom
+
+    low  = np.where(nonzero, np.clip(center - margin, 0, 1), 0)
+    high = np.where(nonzero, np.clip(center + margin, 0, 1), 1)
+
+    return (low, high)
@@ -0,0 +1,101 @@
+"""
+This module contains functions to generate pseudo-experiments (toys).
+"""
+
+import numpy as np
+
+TOYS_CHUNK_SIZE = 4096
+"""Default number of toys drawn at once."""
+
+def spawn_seeds(seed, n):
+    """Split `seed` into `n` independent seeds, e.g. one per parallel worker.
+
+    Parameters
+    ----------
+    seed : int or SeedSequence or None
+        Root seed.
+    n : int
+        Number of independent seeds to spawn.
+
+    Returns
+    -------
+    list of SeedSequence
+        Spawned seeds that give reproducible and independent random streams.
+        The same seeds are returned for the same `seed` on every call.
+    """
+    if isinstance(seed, np.random.SeedSequence):
+        # Spawn from a copy, since spawning advances the spawn counter
+        seed = np.random.SeedSequence(
+            seed.entropy, spawn_key = seed.spawn_key,
+            pool_size = seed.pool_size
+        )
+    else:
+        seed = np.random.SeedSequence(seed)
+
+    return seed.spawn(n)
+
+def iter_poisson_toys(
+    expected, n_toys, seed = None, chunk_size = TOYS_CHUNK_SIZE
+):
+    """Iterate over chunks of Poisson fluctuated histograms.
+
+    Chunk `i` is drawn with the `i`-th seed spawned from `seed`, such that
+    the toys are reproducible for the same `seed` and `chunk_size`.
+
+    Parameters
+    ----------
+    expected : ndarray
+        Expected histogram.
+    n_toys : int
+        Total number of toys.
+    seed : int or SeedSequence or None, optional
+        Seed of the random streams. Default: None.
+    chunk_size : int, optional
+        Number of toys in each chunk. Default: `TOYS_CHUNK_SIZE`.
+
+    Yields
+    ------
+    ndarray, shape (M, ...)
+        Chunk of M <= `chunk_size` toys of the same shape as `expected`.
+    """
+    expected = np.asarray(expected, dtype = float)
+    n_chunks = (n_toys + chunk_size - 1) // chunk_size
+
+    for (idx, chunk_seed) in enumerate(spawn_seeds(seed, n_chunks)):
+        size = min(chunk_size, n_toys - idx * chunk_size)
+        rng  = np.random.default_rng(chunk_seed)
+
+        yield rng.poisson(expected, size = (size, ) + expected.shape)
+
+def generate_poisson_toys(
+    expected, n_toys, seed = None, chunk_size = TOYS_CHUNK_SIZE
+):
+    """Generate a batch of Poisson fluctuated histograms.
+
+    Parameters
+    ----------
+    expected : ndarray
+        Expected histogram.
+    n_toys : int
+        Number of toys to generate.
+    seed : int or SeedSequence or None, optional
+        Seed of the random streams. Default: None.
+    chunk_size : int, optional
+        Number of toys drawn at once, c.f. `iter_poisson_toys`.
+
+    Returns
+    -------
+    ndarray, shape (n_toys, ...)
+        Toys stored as a single array. The result can be passed directly to
+        the vectorized test statistics, e.g. `get_poisson_chi2`.
+    """
+    expected = np.asarray(expected, dtype = float)
+    result   = np.empty((n_toys, ) + expected.shape)
+
+    start = 0
+
+    for chunk in iter_poisson_toys(expected, n_toys, seed, chunk_size):
+        result[start:start + len(chunk)] = chunk
+        start += len(chunk)
+
+    return result
@@ -2,6 +2,19 @@
 This modules contains objects that correspond to the CAFAna Surfaces.
 """
 
-from .fsurface import FSurface
+from .contour   import find_contour_segments
+from .fcsurface import FCSurface
+from .fsurface  import FSurface
+from .funcs     import (
+    combine_fsurfaces, envelope_fsurfaces, make_fsurface, profile_maps,
+    slice_maps, stack_fsurfaces
+)
+from .interp    import find_quadratic_minimum, upsample_map
+from .scan      import scan_fsurface, stack_spectra
 
-__all__ = [ 'FSurface' ]
+__all__ = [
+    'combine_fsurfaces', 'envelope_fsurfaces', 'FCSurface',
+    'find_contour_segments', 'find_quadratic_minimum', 'FSurface',
+    'make_fsurface', 'profile_maps', 'scan_fsurface', 'slice_maps',
+    'stack_fsurfaces', 'stack_spectra', 'upsample_map'
+]
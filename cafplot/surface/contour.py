@@ -0,0 +1,141 @@
+"""
+Functions to extract level contours of 2D histograms without matplotlib.
+"""
+
+import numpy as np
+
+# Cell corners are numbered counterclockwise starting from (x_i, y_j):
+#   0 : (i, j), 1 : (i+1, j), 2 : (i+1, j+1), 3 : (i, j+1)
+# Cell edges are numbered counterclockwise starting from the bottom edge:
+#   0 : corners (0, 1), 1 : corners (1, 2), 2 : corners (3, 2), 3 : (0, 3)
+# Marching squares case is a bitmask of corners that lie above the level.
+# Each case contains up to two segments defined by a pair of cell edges.
+_SEGMENTS = np.array([
+    [ [-1, -1], [-1, -1] ],     #  0
+    [ [ 3,  0], [-1, -1] ],     #  1
+    [ [ 0,  1], [-1, -1] ],     #  2
+    [ [ 3,  1], [-1, -1] ],     #  3
+    [ [ 1,  2], [-1, -1] ],     #  4
+    [ [ 3,  0], [ 1,  2] ],     #  5, saddle
+    [ [ 0,  2], [-1, -1] ],     #  6
+    [ [ 2,  3], [-1, -1] ],     #  7
+    [ [ 2,  3], [-1, -1] ],     #  8
+    [ [ 0,  2], [-1, -1] ],     #  9
+    [ [ 0,  1], [ 2,  3] ],     # 10, saddle
+    [ [ 1,  2], [-1, -1] ],     # 11
+    [ [ 3,  1], [-1, -1] ],     # 12
+    [ [ 0,  1], [-1, -1] ],     # 13
+    [ [ 3,  0], [-1, -1] ],     # 14
+    [ [-1, -1], [-1, -1] ],     # 15
+])
+
+# Resolution of saddle cases when the cell center lies above the level
+_SEGMENTS_SADDLE_HIGH = _SEGMENTS.copy()
+_SEGMENTS_SADDLE_HIGH[ 5] = _SEGMENTS[10]
+_SEGMENTS_SADDLE_HIGH[10] = _SEGMENTS[ 5]
+
+def _interpolate_edge(coord_a, coord_b, z_a, z_b, level):
+    """Find coordinate where level crosses edge between points a and b."""
+    with np.errstate(divide = 'ignore', invalid = 'ignore'):
+        t = (level - z_a) / (z_b - z_a)
+
+    return coord_a + np.clip(np.nan_to_num(t), 0, 1) * (coord_b - coord_a)
+
+def find_contour_segments(x, y, z, levels):
+    """Find level contours of a 2D grid with the marching squares algorithm.
+
+    Contours for all levels are computed in a single vectorized pass over
+    the grid.
+
+    Parameters
+    ----------
+    x : ndarray, shape (N,)
+        Coordinates of the grid points along the first axis.
+    y : ndarray, shape (M,)
+        Coordinates of the grid points along the second axis.
+    z : ndarray, shape (N, M) or (K, N, M)
+        Grid values. If `z` is 3D then each level `levels[k]` is found on the
+        grid `z[k]`.
+    levels : float or array_like of float, shape (K,)
+        Contour levels.
+
+    Returns
+    -------
+    list of ndarray, each of shape (S, 2, 2)
+        Contour segments for each level. Each segment is a pair of points
+        ((x0, y0), (x1, y1)) and can be passed directly to a matplotlib
+        LineCollection.
+    """
+    levels = np.atleast_1d(np.asarray(levels, dtype = float))
+    z      = np.asarray(z, dtype = float)
+
+    if z.ndim == 2:
+        z = z[np.newaxis]
+
+    z = np.broadcast_to(z, (len(levels), ) + z.shape[1:])
+    level = levels[:, np.newaxis, np.newaxis]
+
+    z0 = z[:, :-1, :-1]
+    z1 = z[:,  1:, :-1]
+    z2 = z[:,  1:,  1:]
+    z3 = z[:, :-1,  1:]
+
+    case = (
+          (z0 > level) * 1 + (z1 > level) * 2
+        + (z2 > level) * 4 + (z3 > level) * 8
+    )
+
+    finite = (
+        np.isfinite(z0) & np.isfinite(z1) & np.isfinite(z2) & np.isfinite(z3)
+    )
+    case[~finite] = 0
+
+    center_high = ((z0 + z1 + z2 + z3) / 4 > level)
+    segments    = np.where(
+        center_high[..., np.newaxis, np.newaxis],
+        _SEGMENTS_SADDLE_HIGH[case], _SEGMENTS[case]
+    )
+
+    x0 = x[:-1][np.newaxis, :, np.newaxis]
+    x1 = x[ 1:][np.newaxis, :, np.newaxis]
+    y0 = y[:-1][np.newaxis, np.newaxis, :]
+    y1 = y[ 1:][np.newaxis, np.newaxis, :]
+
+    # Crossing points for each of the 4 cell edges, shape (K, N-1, M-1, 4, 2)
+    shape  = case.shape
+    points = np.stack([
+        np.stack([
+            _interpolate_edge(x0, x1, z0, z1, level),
+            np.broadcast_to(y0, shape)
+        ], axis = -1),
+        np.stack([
+            np.broadcast_to(x1, shape),
+            _interpolate_edge(y0, y1, z1, z2, level)
+        ], axis = -1),
+        np.stack([
+            _interpolate_edge(x0, x1, z3, z2, level),
+            np.broadcast_to(y1, shape)
+        ], axis = -1),
+        np.stack([
+            np.broadcast_to(x0, shape),
+            _interpolate_edge(y0, y1, z0, z3, level)
+        ], axis = -1),
+    ], axis = -2)
+
+    result = []
+
+    for k in range(len(levels)):
+        seg_edges = segments[k].reshape((-1, 2))
+        seg_cells = np.repeat(np.arange(case[k].size), 2)
+        mask      = (seg_edges[:, 0] >= 0)
+
+        cell_points = points[k].reshape((-1, 4, 2))
+        seg_cells   = seg_cells[mask]
+        seg_edges   = seg_edges[mask]
+
+        result.append(np.stack([
+            cell_points[seg_cells, seg_edges[:, 0]],
+            cell_points[seg_cells, seg_edges[:, 1]],
+        ], axis = 1))
+
+    return result
@@ -0,0 +1,162 @@
+"""
+This module defines FCSurface -- a FrequentistSurface with Feldman-Cousins
+corrections.
+"""
+
+import numpy as np
+
+from cafplot.rhist import RHist2D
+from .interp  import upsample_map
+from .surface import Surface
+
+class FCSurface(Surface):
+    """A Surface with Feldman-Cousins corrected critical values
+
+    Each point of the surface is assumed to represent a Log-Likelihood
+    for x,y coordinates to assume given values. Unlike `FSurface`, critical
+    values of the surface are not global, but are given per bin by the
+    Feldman-Cousins critical value maps. Contours of `FCSurface` are the
+    unit level lines of the ratio maps `rhist` / critical values.
+
+    Parameters
+    ----------
+    rhist : RHist2D
+        2D histogram containing surface "heights".
+    best_value : float
+        Best fit value for the surface. Typically a minimum of `rhist.
+    best_x : float
+        X-coordinate of the best fit value for the surface.
+    best_y : float
+        Y-coordinate of the best fit value for the surface.
+    crit_maps : dict of { float : RHist2D }
+        Dictionary of critical value maps, keyed by significance expressed
+        as a number of Gaussian sigmas. Maps must have the same binning
+        as `rhist`.
+    """
+
+    def __init__(self, rhist, best_value, best_x, best_y, crit_maps):
+        # pylint: disable=protected-access
+        super(FCSurface, self).__init__(rhist, best_value, best_x, best_y)
+
+        for crit_map in crit_maps.values():
+            if not rhist._are_bins_compatible(crit_map):
+                raise ValueError(
+                    "Critical value map binning is incompatible with surface"
+                )
+
+        self._crit_maps = {
+            float(sigma) : crit_map for (sigma, crit_map) in crit_maps.items()
+        }
+
+    @property
+    def crit_maps(self):
+        """Dictionary of critical value maps keyed by sigma."""
+        return self._crit_maps
+
+    def _check_sigma(self, sigma):
+        if float(sigma) not in self._crit_maps:
+            raise KeyError("No critical value map for sigma %s" % (sigma, ))
+
+    def level(self, sigma = 1, best_value = None):
+        """Calculate level of the ratio map corresponding to `sigma`.
+
+        Critical values of `FCSurface` are given per bin, hence contours are
+        found as the unit level lines of the ratio maps, c.f. `ratio_map`.
+
+        Parameters
+        ----------
+        sigma : float, optional
+            Significance expressed as a number of Gaussian sigmas.
+            Default: 1.
+        best_value : None, optional
+            Not supported, since critical value maps can not be shifted by
+            a single level. Default: None.
+
+        Returns
+        -------
+        float
+            Level of the `ratio_map(sigma)`, which is always 1.
+        """
+        return float(self.levels([ sigma, ], best_value)[0])
+
+    def levels(self, sigmas, best_value = None):
+        """Calculate levels of the ratio maps corresponding to `sigmas`.
+
+        c.f. `level`
+        """
+        if best_value is not None:
+            raise ValueError(
+                "FCSurface levels can not be shifted to a best value"
+            )
+
+        for sigma in sigmas:
+            self._check_sigma(sigma)
+
+        return np.ones(len(sigmas))
+
+    def contour_rhist(self, sigma = 1):
+        """Return ratio map as RHist2D and its level to draw `sigma` contour.
+
+        c.f. `Surface.contour_rhist`
+        """
+        return (
+            RHist2D(self._rhist.bins, self.ratio_map(sigma)), self.level(sigma)
+        )
+
+    def ratio_map(self, sigma = 1):
+        """Return (cached) ratio of the surface to the critical value map.
+
+        Parameters
+        ----------
+        sigma : float, optional
+            Significance of the critical value map expressed as a number of
+            Gaussian sigmas. Default: 1.
+
+        Returns
+        -------
+        ndarray
+            Ratio map. Bins with non-positive critical values are NaN.
+        """
+        self._check_sigma(sigma)
+
+        sigma = float(sigma)
+        key   = ('ratio', sigma)
+
+        if key not in self._cache:
+            crit = self._crit_maps[sigma].hist
+
+            self._cache[key] = np.divide(
+                self._rhist.hist, crit,
+                out = np.full(crit.shape, np.nan), where = (crit > 0)
+            )
+
+        return self._cache[key]
+
+    def _contour_maps(self, sigmas):
+        maps = np.stack([ self.ratio_map(s) for s in sigmas ])
+        return (maps, self.levels(sigmas))
+
+    def upsample(self, factor = 4, order = 3):
+        """Interpolate surface and its critical value maps onto a finer grid.
+
+        c.f. `Surface.upsample`
+        """
+        key = ('upsample', factor, order)
+
+        if key not in self._cache:
+            hist, bins = upsample_map(
+                self._rhist.hist, self._rhist.bins, factor, order
+            )
+
+            crit_maps = {
+                sigma : RHist2D(bins, upsample_map(
+                    crit_map.hist, crit_map.bins, factor, order
+                )[0]) for (sigma, crit_map) in self._crit_maps.items()
+            }
+
+            self._cache[key] = FCSurface(
+                RHist2D(bins, hist),
+                self._best_val, self._best_x, self._best_y, crit_maps
+            )
+
+        return self._cache[key]
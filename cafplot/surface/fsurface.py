@@ -2,6 +2,7 @@
 This module defines FSurface corresponding to the CAFAna FrequentistSurface
 """
 
+import numpy as np
 import scipy.stats as ss
 
 from cafplot.stats import gauss_sigma_to_prob
@@ -34,7 +35,27 @@ class FSurface(Surface):
         float
             Surface level.
         """
-        prob = gauss_sigma_to_prob(sigma)
+        return float(self.levels([ sigma, ], best_value)[0])
+
+    def levels(self, sigmas, best_value = None):
+        """Calculate surface levels corresponding to a list of `sigmas`.
+
+        This is a vectorized version of `level`.
+
+        Parameters
+        ----------
+        sigmas : list of float
+            Probabilities expressed as a number of Gaussian sigmas.
+        best_value : float or None, optional
+            If `best_value` is not None, then shift resulting surface levels
+            `best_value` - `self.best_value`. Default: None.
+
+        Returns
+        -------
+        ndarray
+            Surface levels, one for each sigma.
+        """
+        prob = gauss_sigma_to_prob(np.asarray(sigmas, dtype = float))
 
         result = ss.chi2.isf(1 - prob, 2)
 
@@ -43,3 +64,26 @@ class FSurface(Surface):
 
         return result
 
+    def levels_1d(self, sigmas):
+        """Calculate levels of 1D surface profiles and slices.
+
+        This function finds levels such that the probability of a point
+        drawn from the $\\chi^2$ distribution with 1 degree of freedom to lie
+        below that level is given by Gaussian `sigmas`.
+
+        Parameters
+        ----------
+        sigmas : list of float
+            Probabilities expressed as a number of Gaussian sigmas.
+
+        Returns
+        -------
+        ndarray
+            Levels, one for each sigma.
+
+        See Also
+        --------
+        Surface.profile, Surface.slice
+        """
+        prob = gauss_sigma_to_prob(np.asarray(sigmas, dtype = float))
+        return ss.chi2.isf(1 - prob, 1)
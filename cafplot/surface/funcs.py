@@ -0,0 +1,174 @@
+"""
+Functions to combine and profile multiple FSurface objects.
+"""
+
+import numpy as np
+
+from cafplot.rhist import RHist2D
+from .fsurface import FSurface
+from .interp   import find_bin
+
+def make_fsurface(hist, bins, best_value = 0):
+    """Construct `FSurface` from a map of chi^2 values.
+
+    This function finds the best fit as the minimum of `hist`, and shifts
+    `hist` such that its minimum becomes 0.
+
+    Parameters
+    ----------
+    hist : ndarray, shape (N, M)
+        Map of chi^2 values.
+    bins : list of ndarray
+        Bin edges of the map.
+    best_value : float, optional
+        Offset of `hist` values. Default: 0.
+
+    Returns
+    -------
+    FSurface
+        Surface with best fit value `best_value` + min(`hist`).
+    """
+    idx       = np.unravel_index(np.nanargmin(hist), hist.shape)
+    idx_x     = idx[0]
+    idx_y     = idx[1]
+    min_value = hist[idx_x, idx_y]
+
+    best_x = (bins[0][idx_x] + bins[0][idx_x + 1]) / 2
+    best_y = (bins[1][idx_y] + bins[1][idx_y + 1]) / 2
+
+    return FSurface(
+        RHist2D(bins, hist - min_value),
+        best_value + min_value, best_x, best_y
+    )
+
+def stack_fsurfaces(surfaces):
+    """Stack maps of surfaces with common binning into a single array.
+
+    Parameters
+    ----------
+    surfaces : list of FSurface
+        Surfaces to be stacked.
+
+    Returns
+    -------
+    (hists, bins, best_values) : (ndarray, list of ndarray, ndarray)
+        Stacked surface maps of shape (K, N, M), common bin edges and
+        best fit values of shape (K,).
+    """
+    # pylint: disable=protected-access
+    bins = surfaces[0].rhist.bins
+
+    for surface in surfaces[1:]:
+        if not surfaces[0].rhist._are_bins_compatible(surface.rhist):
+            raise ValueError("Surfaces have incompatible binnings")
+
+    hists       = np.stack([ s.rhist.hist for s in surfaces ])
+    best_values = np.array([ s.best_value for s in surfaces ])
+
+    return (hists, bins, best_values)
+
+def _coerce_stack(surfaces, bins, best_values):
+    """Convert `surfaces` into a stack of surface maps."""
+    if isinstance(surfaces, np.ndarray):
+        if bins is None:
+            raise ValueError("Bins must be specified for a stack of maps")
+
+        if best_values is None:
+            best_values = np.zeros(len(surfaces))
+
+        return (surfaces, bins, np.asarray(best_values))
+
+    return stack_fsurfaces(surfaces)
+
+def combine_fsurfaces(surfaces, bins = None, best_values = None):
+    """Combine surfaces of independent measurements by adding their chi^2.
+
+    Parameters
+    ----------
+    surfaces : list of FSurface or ndarray, shape (K, N, M)
+        Surfaces to be combined. Either a list of `FSurface` with common
+        binning or a stack of delta chi^2 maps.
+    bins : list of ndarray or None, optional
+        Bin edges of the maps. Required if `surfaces` is ndarray.
+    best_values : ndarray, shape (K,), or None, optional
+        Best fit values of the maps, if `surfaces` is ndarray.
+        Default: zeros.
+
+    Returns
+    -------
+    FSurface
+        Combined surface with best fit found at the minimum of the total
+        chi^2.
+    """
+    hists, bins, best_values = _coerce_stack(surfaces, bins, best_values)
+
+    return make_fsurface(
+        np.sum(hists, axis = 0), bins, np.sum(best_values)
+    )
+
+def envelope_fsurfaces(surfaces, bins = None, best_values = None):
+    """Construct envelope (pointwise minimum) of chi^2 surfaces.
+
+    This function is useful to profile over discrete choices of
+    systematic variants.
+
+    Parameters
+    ----------
+    surfaces : list of FSurface or ndarray, shape (K, N, M)
+        Surfaces to be enveloped. Either a list of `FSurface` with common
+        binning or a stack of delta chi^2 maps.
+    bins : list of ndarray or None, optional
+        Bin edges of the maps. Required if `surfaces` is ndarray.
+    best_values : ndarray, shape (K,), or None, optional
+        Best fit values of the maps, if `surfaces` is ndarray.
+        Default: zeros.
+
+    Returns
+    -------
+    FSurface
+        Envelope surface with best fit found at the minimum of the envelope.
+    """
+    hists, bins, best_values = _coerce_stack(surfaces, bins, best_values)
+
+    return make_fsurface(
+        np.min(hists + best_values[:, np.newaxis, np.newaxis], axis = 0), bins
+    )
+
+def profile_maps(hists, axis = 0):
+    """Profile a stack of surface maps along `axis`.
+
+    Parameters
+    ----------
+    hists : ndarray, shape (K, N, M)
+        Stack of surface maps.
+    axis : { 0, 1 }
+        Axis of the surface parameter to keep. Default: 0.
+
+    Returns
+    -------
+    ndarray, shape (K, N) or (K, M)
+        Profiles of each map, c.f. `Surface.profile`.
+    """
+    return np.nanmin(hists, axis = 2 - axis)
+
+def slice_maps(hists, bins, axis = 0, value = 0):
+    """Slice a stack of surface maps along `axis`.
+
+    Parameters
+    ----------
+    hists : ndarray, shape (K, N, M)
+        Stack of surface maps.
+    bins : list of ndarray
+        Bin edges of the maps.
+    axis : { 0, 1 }
+        Axis of the surface parameter to keep. Default: 0.
+    value : float
+        Value of the other surface parameter.
+
+    Returns
+    -------
+    ndarray, shape (K, N) or (K, M)
+        Raster scan slices of each map, c.f. `Surface.slice`.
+    """
+    result = np.take(hists, find_bin(bins[1 - axis], value), axis = 2 - axis)
+    return result - np.nanmin(result, axis = 1, keepdims = True)
@@ -0,0 +1,154 @@
+"""
+Functions to interpolate surface maps and refine their minima.
+"""
+
+import numpy as np
+from scipy.interpolate import RectBivariateSpline
+
+def get_bin_centers(bins):
+    """Return bin centers for bin edges `bins`."""
+    return (bins[1:] + bins[:-1]) / 2
+
+def find_bin(bins, value):
+    """Return index of the bin of `bins` containing `value` (clipped)."""
+    return np.clip(
+        np.searchsorted(bins, value, side = 'right') - 1, 0, len(bins) - 2
+    )
+
+def split_bins(bins, factor):
+    """Split each bin of `bins` into `factor` equal sub-bins."""
+    n = len(bins) - 1
+    return np.interp(np.linspace(0, n, n * factor + 1), np.arange(n + 1), bins)
+
+def upsample_map(hist, bins, factor, order = 3):
+    """Interpolate 2D map onto a finer grid with a spline.
+
+    Parameters
+    ----------
+    hist : ndarray, shape (N, M)
+        Map values at bin centers.
+    bins : list of ndarray
+        Bin edges of the map.
+    factor : int
+        Upsampling factor. Each bin is split into `factor` x `factor`
+        sub-bins.
+    order : int, optional
+        Order of the interpolating spline. 1 -- linear, 3 -- bicubic.
+        Default: 3.
+
+    Returns
+    -------
+    (hist, bins) : (ndarray, list of ndarray)
+        Interpolated map of shape (N * factor, M * factor) and its bin edges.
+    """
+    bins_x, bins_y = bins
+
+    spline = RectBivariateSpline(
+        get_bin_centers(bins_x), get_bin_centers(bins_y), hist,
+        bbox = [ bins_x[0], bins_x[-1], bins_y[0], bins_y[-1] ],
+        kx = order, ky = order
+    )
+
+    fine_bins = [ split_bins(bins_x, factor), split_bins(bins_y, factor) ]
+    fine_hist = spline(
+        get_bin_centers(fine_bins[0]), get_bin_centers(fine_bins[1])
+    )
+
+    return (fine_hist, fine_bins)
+
+def find_quadratic_minimum(hists, bins):
+    """Find sub-bin minima of 2D maps by a local quadratic fit.
+
+    For each map a quadratic function is fitted to the 3 x 3 neighborhood of
+    its grid minimum. If the fitted function has a minimum within that
+    neighborhood, then it is used as the map minimum. Otherwise, the grid
+    minimum is returned.
+
+    Parameters
+    ----------
+    hists : ndarray, shape (N, M) or (K, N, M)
+        Map (or a stack of maps) values at bin centers.
+    bins : list of ndarray
+        Bin edges of the maps.
+
+    Returns
+    -------
+    (x, y, value) : tuple of 3 float or tuple of 3 ndarray of shape (K,)
+        Coordinates of the minima and values of the maps at the minima.
+    """
+    hists  = np.asarray(hists, dtype = float)
+    single = (hists.ndim == 2)
+
+    if single:
+        hists = hists[np.newaxis]
+
+    n_maps, n_x, n_y = hists.shape
+
+    if (n_x < 3) or (n_y < 3):
+        raise ValueError("Quadratic fit requires at least 3 x 3 grid")
+
+    centers_x = get_bin_centers(bins[0])
+    centers_y = get_bin_centers(bins[1])
+
+    idx   = np.unravel_index(
+        np.nanargmin(hists.reshape((n_maps, -1)), axis = 1), (n_x, n_y)
+    )
+    idx_x = idx[0]
+    idx_y = idx[1]
+
+    # Center of the 3 x 3 neighborhood inside the grid
+    ctr_x = np.clip(idx_x, 1, n_x - 2)
+    ctr_y = np.clip(idx_y, 1, n_y - 2)
+
+    offsets = np.array([ -1, 0, 1 ])
+    nbr_x   = (ctr_x[:, np.newaxis] + offsets)[:, :, np.newaxis]
+    nbr_y   = (ctr_y[:, np.newaxis] + offsets)[:, np.newaxis, :]
+
+    values = hists[np.arange(n_maps)[:, np.newaxis, np.newaxis], nbr_x, nbr_y]
+    values = values.reshape((n_maps, 9))
+
+    dx = np.broadcast_to(
+        centers_x[nbr_x] - centers_x[ctr_x][:, np.newaxis, np.newaxis],
+        (n_maps, 3, 3)
+    ).reshape((n_maps, 9))
+    dy = np.broadcast_to(
+        centers_y[nbr_y] - centers_y[ctr_y][:, np.newaxis, np.newaxis],
+        (n_maps, 3, 3)
+    ).reshape((n_maps, 9))
+
+    # f(dx, dy) = c0 + c1 dx + c2 dy + c3 dx^2 + c4 dx dy + c5 dy^2
+    design = np.stack(
+        [ np.ones(dx.shape), dx, dy, dx**2, dx * dy, dy**2 ], axis = -1
+    )
+    coeffs = np.einsum(
+        'kij,kj->ki', np.linalg.pinv(design), np.nan_to_num(values)
+    )
+
+    c0, c1, c2, c3, c4, c5 = coeffs.T
+    det = 4 * c3 * c5 - c4**2
+
+    with np.errstate(divide = 'ignore', invalid = 'ignore'):
+        min_dx = (c4 * c2 - 2 * c5 * c1) / det
+        min_dy = (c4 * c1 - 2 * c3 * c2) / det
+
+    min_value = (
+          c0 + c1 * min_dx + c2 * min_dy
+        + c3 * min_dx**2 + c4 * min_dx * min_dy + c5 * min_dy**2
+    )
+
+    valid = (
+           (det > 0) & (c3 > 0) & np.all(np.isfinite(values), axis = 1)
+        & (min_dx >= dx.min(axis = 1)) & (min_dx <= dx.max(axis = 1))
+        & (min_dy >= dy.min(axis = 1)) & (min_dy <= dy.max(axis = 1))
+    )
+
+    x     = np.where(valid, centers_x[ctr_x] + min_dx, centers_x[idx_x])
+    y     = np.where(valid, centers_y[ctr_y] + min_dy, centers_y[idx_y])
+    value = np.where(
+        valid, min_value, hists[np.arange(n_maps), idx_x, idx_y]
+    )
+
+    if single:
+        return (float(x[0]), float(y[0]), float(value[0]))
+
+    return (x, y, value)
@@ -0,0 +1,117 @@
+"""
+Functions to build FSurface objects by scanning a 2D parameter grid.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+from cafplot.spectrum import Spectrum
+from cafplot.stats    import get_poisson_chi2
+from .funcs  import make_fsurface
+from .interp import get_bin_centers
+
+def stack_spectra(spectra, pot = None, livetime = None):
+    """Stack a grid of template spectra into a single array.
+
+    Parameters
+    ----------
+    spectra : list of list of Spectrum
+        Template spectra, `spectra[i][j]` corresponding to the grid point
+        (x_i, y_j).
+    pot : float or None, optional
+        POT value to normalize templates to, c.f. `Spectrum.rhist`.
+    livetime : float or None, optional
+        Livetime value to normalize templates to, c.f. `Spectrum.rhist`.
+
+    Returns
+    -------
+    ndarray, shape (N, M, ...)
+        Normalized template histograms.
+    """
+    return np.stack([
+        np.stack([ s.rhist(pot, livetime).hist for s in row ])
+            for row in spectra
+    ])
+
+def _get_data_hist(data):
+    if isinstance(data, Spectrum):
+        # pylint: disable=protected-access
+        return data._rhist.hist
+
+    return data.hist
+
+def _scan_chunk(data, prediction, x, y):
+    """Calculate Poisson chi^2 for a chunk of grid points."""
+    if callable(prediction):
+        prediction = prediction(x, y)
+
+    pred = np.asarray(prediction).reshape((len(x), -1))
+    return get_poisson_chi2(data.ravel()[np.newaxis, :], pred)
+
+def scan_fsurface(
+    data, prediction, bins, chunk_size = 1024, n_workers = None
+):
+    """Build `FSurface` by scanning a 2D parameter grid.
+
+    For each point of the grid this function calculates Poisson
+    log-likelihood chi^2 of the `data` given the prediction at that point.
+    Grid points are processed in vectorized chunks of `chunk_size`, which
+    bounds memory usage, and chunks may be distributed across processes.
+
+    Parameters
+    ----------
+    data : Spectrum or RHist
+        Observed data. If `data` is a Spectrum, then its histogram is used
+        as is, i.e. predictions should be normalized to the data exposure.
+    prediction : callable or ndarray
+        If `prediction` is callable, then it is called as
+        `prediction(x, y)` with arrays of grid point coordinates of shape
+        (K,) and must return predicted histograms of shape (K, ...).
+        Otherwise, `prediction` is an array of predicted histograms of shape
+        (N, M, ...) for each grid point, c.f. `stack_spectra`.
+    bins : list of ndarray
+        Bin edges of the grid. Grid points are the bin centers.
+    chunk_size : int, optional
+        Number of grid points processed at once. Default: 1024.
+    n_workers : int or None, optional
+        If not None, distribute chunks across `n_workers` processes.
+        In that case callable `prediction` must be picklable.
+        Default: None.
+
+    Returns
+    -------
+    FSurface
+        Delta chi^2 surface with the best fit at the chi^2 minimum.
+    """
+    data_hist = _get_data_hist(data)
+
+    grid_x, grid_y = np.meshgrid(
+        get_bin_centers(bins[0]), get_bin_centers(bins[1]), indexing = 'ij'
+    )
+    shape  = grid_x.shape
+    grid_x = grid_x.ravel()
+    grid_y = grid_y.ravel()
+
+    if not callable(prediction):
+        prediction = np.asarray(prediction)
+        prediction = prediction.reshape((grid_x.size, -1))
+
+    chunks = []
+
+    for start in range(0, grid_x.size, chunk_size):
+        chunk = slice(start, start + chunk_size)
+
+        if callable(prediction):
+            pred = prediction
+        else:
+            pred = prediction[chunk]
+
+        chunks.append((data_hist, pred, grid_x[chunk], grid_y[chunk]))
+
+    if n_workers is None:
+        chi2 = [ _scan_chunk(*args) for args in chunks ]
+    else:
+        with ProcessPoolExecutor(n_workers) as executor:
+            chi2 = list(executor.map(_scan_chunk, *zip(*chunks)))
+
+    return make_fsurface(np.concatenate(chi2).reshape(shape), bins)
@@ -3,6 +3,14 @@ This module defines an abstract Surface class corresponding to ISurface in
 CAFAna
 """
 
+import numpy as np
+
+from cafplot.rhist import RHist1D, RHist2D
+from .contour import find_contour_segments
+from .interp  import (
+    find_bin, find_quadratic_minimum, get_bin_centers, upsample_map
+)
+
 class Surface:
     """An abstract class corresponding to the CAFAna ISurface
 
@@ -22,6 +30,8 @@ class Surface:
         self._best_val = best_value
         self._best_x   = best_x
         self._best_y   = best_y
+        self._contours = {}
+        self._cache    = {}
 
     @property
     def rhist(self):
@@ -42,3 +52,177 @@ class Surface:
         """Calculate surface level corresponding to `sigma` significance."""
         raise NotImplementedError
 
+    def levels(self, sigmas, best_value = None):
+        """Calculate surface levels corresponding to a list of `sigmas`."""
+        return np.array([ self.level(s, best_value) for s in sigmas ])
+
+    def contour_rhist(self, sigma = 1):
+        """Return histogram and its level to draw `sigma` contour from.
+
+        Returns
+        -------
+        (rhist, level) : (RHist2D, float)
+            Histogram, which level line `level` is the `sigma` contour.
+        """
+        return (self._rhist, self.level(sigma))
+
+    def _contour_maps(self, sigmas):
+        """Return surface map(s) and levels to extract `sigmas` contours from.
+
+        Returns
+        -------
+        (z, levels) : (ndarray, ndarray)
+            Surface map of shape (N, M) (or maps of shape (K, N, M), one per
+            sigma) and contour levels of shape (K,).
+        """
+        return (self._rhist.hist, self.levels(sigmas))
+
+    def contours(self, sigmas = (1, 2, 3)):
+        """Find surface contours corresponding to `sigmas` significances.
+
+        Contours are extracted from the surface bin centers for all `sigmas`
+        at once and cached, so that repeated calls are cheap.
+
+        Parameters
+        ----------
+        sigmas : list of float, optional
+            Significances expressed as a number of Gaussian sigmas.
+            Default: (1, 2, 3).
+
+        Returns
+        -------
+        list of ndarray, each of shape (S, 2, 2)
+            Contour segments for each sigma, c.f. `find_contour_segments`.
+        """
+        sigmas  = [ float(s) for s in np.atleast_1d(sigmas) ]
+        missing = [ s for s in sigmas if s not in self._contours ]
+
+        if missing:
+            centers_x = get_bin_centers(self._rhist.bins_x)
+            centers_y = get_bin_centers(self._rhist.bins_y)
+
+            z, levels = self._contour_maps(missing)
+            segments  = find_contour_segments(centers_x, centers_y, z, levels)
+
+            self._contours.update(zip(missing, segments))
+
+        return [ self._contours[s] for s in sigmas ]
+
+    def _copy_with_rhist(self, rhist):
+        """Make a copy of the surface with a different `rhist`."""
+        return type(self)(rhist, self._best_val, self._best_x, self._best_y)
+
+    def upsample(self, factor = 4, order = 3):
+        """Interpolate surface onto a finer grid.
+
+        The interpolated surface is cached, such that contours derived from
+        it are cached as well.
+
+        Parameters
+        ----------
+        factor : int, optional
+            Upsampling factor. Each surface bin is split into
+            `factor` x `factor` sub-bins. Default: 4.
+        order : int, optional
+            Order of the interpolating spline. 1 -- linear, 3 -- bicubic.
+            Default: 3.
+
+        Returns
+        -------
+        Surface
+            Surface of the same type with interpolated `rhist`.
+
+        See Also
+        --------
+        upsample_map : performs the actual interpolation
+        """
+        key = ('upsample', factor, order)
+
+        if key not in self._cache:
+            hist, bins = upsample_map(
+                self._rhist.hist, self._rhist.bins, factor, order
+            )
+            self._cache[key] = self._copy_with_rhist(RHist2D(bins, hist))
+
+        return self._cache[key]
+
+    def refine_best_fit(self):
+        """Estimate sub-bin best fit by a local quadratic fit of the surface.
+
+        Returns
+        -------
+        (x, y, value) : tuple of 3 float
+            Refined best fit coordinates and the best fit value.
+
+        See Also
+        --------
+        find_quadratic_minimum : performs the actual fit
+        """
+        if 'best_fit' not in self._cache:
+            x, y, value = find_quadratic_minimum(
+                self._rhist.hist, self._rhist.bins
+            )
+            self._cache['best_fit'] = (x, y, self._best_val + value)
+
+        return self._cache['best_fit']
+
+    def _check_axis(self, axis):
+        if axis not in (0, 1):
+            raise ValueError("Surface axis must be 0 or 1, got %s" % (axis, ))
+
+    def profile(self, axis = 0):
+        """Profile surface along `axis` by minimizing over the other axis.
+
+        Parameters
+        ----------
+        axis : { 0, 1 }
+            Axis of the surface parameter to keep. Default: 0.
+
+        Returns
+        -------
+        RHist1D
+            Surface profile as a function of the `axis` parameter.
+        """
+        self._check_axis(axis)
+        key = ('profile', axis)
+
+        if key not in self._cache:
+            hist = np.nanmin(self._rhist.hist, axis = 1 - axis)
+            self._cache[key] = RHist1D([ self._rhist.bins[axis], ], hist)
+
+        return self._cache[key]
+
+    def slice(self, axis = 0, value = None):
+        """Slice surface along `axis` at a fixed value of the other parameter.
+
+        This corresponds to the raster scan, i.e. the slice is shifted such
+        that its minimum is 0.
+
+        Parameters
+        ----------
+        axis : { 0, 1 }
+            Axis of the surface parameter to keep. Default: 0.
+        value : float or None, optional
+            Value of the other surface parameter. If None, the slice is taken
+            at the best fit. Default: None.
+
+        Returns
+        -------
+        RHist1D
+            Surface slice as a function of the `axis` parameter.
+        """
+        self._check_axis(axis)
+
+        if value is None:
+            value = self.best_fit[1 - axis]
+
+        idx = find_bin(self._rhist.bins[1 - axis], value)
+        key = ('slice', axis, idx)
+
+        if key not in self._cache:
+            hist = np.take(self._rhist.hist, idx, axis = 1 - axis)
+            self._cache[key] = RHist1D(
+                [ self._rhist.bins[axis], ], hist - np.nanmin(hist)
+            )
+
+        return self._cache[key]
@@ -18,8 +18,9 @@ setuptools.setup(
     description      = 'Library to plot CAFAna objects in python/matplotlib',
     install_requires = [
         'numpy',
-        'matplotlib',
+        'matplotlib>=3.6',
         'scipy',
+        'pillow',
     ],
     license          = 'MIT',
     long_description = readme(),